@@ -6,20 +6,50 @@ Contains tools for building, installation, remote management, etc.
 
 __version__ = "0.1.27"
 
-# Import core components for external use
-from .cert_mgr import CertManager
-from . import buckyos_kit
-from . import cert_mgr
-
-# Import project configuration
-from .project import (
-    BuckyProject,
-    AppInfo,
-    WebModuleInfo,
-    RustModuleInfo
-)
-
-from .install import install_app_data, reinstall_app, update_app, clean_app
+import importlib
+
+# Certificate and installation names are resolved lazily (PEP 562), so importing the
+# package does not load cert_mgr or install. The build pipeline (build, build_rust,
+# build_web_apps, prepare_rootfs, project, buckyos_kit) is still imported eagerly
+# through `build`, see below.
+_LAZY_ATTRS = {
+    # Certificate management
+    'CertManager': '.cert_mgr',
+
+    # Project configuration
+    'BuckyProject': '.project',
+    'AppInfo': '.project',
+    'WebModuleInfo': '.project',
+    'RustModuleInfo': '.project',
+
+    # Installation
+    'install_app_data': '.install',
+    'reinstall_app': '.install',
+    'update_app': '.install',
+    'clean_app': '.install',
+}
+
+_LAZY_MODULES = ('buckyos_kit', 'cert_mgr')
+
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        value = importlib.import_module(f'.{name}', __name__)
+    elif name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    # List the lazy names too, for dir() and tab completion
+    return list(__all__)
+
+
+# `build` shares its name with the `build` submodule, so it is bound eagerly:
+# a lazy lookup would be shadowed once the submodule is imported.
 from .build import build
 
 # Export main components
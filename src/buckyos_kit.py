@@ -2,53 +2,240 @@ import subprocess
 import platform
 import os
 import locale
+import shlex
+import signal
+import stat
+import csv
+import time
+import errno
+import selectors
+import socket
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 _system_name = platform.system()
 
-def get_execute_name(file_name) -> str:
-    # Convert to string if it's a Path object or other type
-    file_name = str(file_name)
-    if _system_name == "Windows":
+@lru_cache(maxsize=256)
+def _execute_name(file_name: str, system_name: str) -> str:
+    if system_name == "Windows":
         # Only add .exe if the filename (basename) has no extension
         base_name = os.path.basename(file_name)
         if '.' not in base_name:
             file_name = file_name + ".exe"
     return file_name
 
+def get_execute_name(file_name) -> str:
+    # Convert to string if it's a Path object or other type
+    return _execute_name(str(file_name), _system_name)
+
 def ensure_executable(file_path: str):
     if _system_name == "Windows":
         return
         
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File {file_path} not found")
-    if not os.path.isfile(file_path):
+    try:
+        mode = os.stat(file_path).st_mode
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File {file_path} not found") from None
+    if not stat.S_ISREG(mode):
         raise ValueError(f"File {file_path} is not a file")
-    os.system(f"chmod +x {file_path}")
+    os.chmod(file_path, mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+def _report_walk_error(error: OSError) -> None:
+    print(f"Warning: unable to open {error.filename}: {error}")
 
 def ensure_directory_accessible(directory_path):
-    if not os.path.exists(directory_path):
-        os.makedirs(directory_path, exist_ok=True)
-    os.system(f"chmod 777 -R {directory_path}")
-    
+    os.makedirs(directory_path, exist_ok=True)
+    os.chmod(directory_path, 0o777)
+    # Subdirectories are opened up before the walk descends into them, so
+    # unreadable ones (e.g. 0o000) are entered instead of skipped
+    if not hasattr(os, "fwalk"):
+        for root, dirs, files in os.walk(directory_path, onerror=_report_walk_error):
+            for name in dirs + files:
+                path = os.path.join(root, name)
+                if not os.path.islink(path):
+                    os.chmod(path, 0o777)
+        return
+
+    # fwalk hands out an fd per directory, so entries are changed relative to it
+    # instead of re-resolving the full path for every file
+    for _, dirs, files, dir_fd in os.fwalk(directory_path, onerror=_report_walk_error):
+        for name in dirs + files:
+            # Like chmod -R, leave symlinks (and whatever they point to) alone
+            if stat.S_ISLNK(os.stat(name, dir_fd=dir_fd, follow_symlinks=False).st_mode):
+                continue
+            os.chmod(name, 0o777, dir_fd=dir_fd)
+
+
+# read/write chunk for the user-space copy paths, 16x shutil's 64 KiB default
+COPY_BUFSIZE = 1 << 20
+
+# copy_file_range refuses these (old kernel, cross-device before 5.19, unsupported fs), shutil handles them
+_COPY_FILE_RANGE_FALLBACK_ERRNOS = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM}
+
+def fast_copyfile(src, dst):
+    """Copy file content only, in-kernel via os.copy_file_range where available (reflink on btrfs/xfs)"""
+    if not hasattr(os, "copy_file_range"):
+        return shutil.copyfile(src, dst)
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                pass
+        except OSError as e:
+            if e.errno not in _COPY_FILE_RANGE_FALLBACK_ERRNOS:
+                raise
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, COPY_BUFSIZE)
+    return dst
+
+
+def fast_copy2(src, dst):
+    """shutil.copy2 for file paths, with the content copied by fast_copyfile"""
+    fast_copyfile(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
+
+def link_or_copyfile(src, dst):
+    """Hard-link src to dst, copying the content when linking is not possible (e.g. another filesystem)"""
+    try:
+        if os.path.samefile(src, dst):
+            return dst
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        fast_copyfile(src, dst)
+    return dst
+
+
+def parallel_copytree(src, dst, workers: int = 8, dirs_exist_ok: bool = False, copy_function=fast_copy2):
+    """shutil.copytree with the file copies spread over a thread pool
+
+    The whole tree is scanned and every directory created first, so the workers only copy file bytes.
+    Like copytree's defaults, symlinks are followed and directory stat is copied last.
+    """
+    os.makedirs(dst, exist_ok=dirs_exist_ok)
+    dirs = [(os.fspath(src), os.fspath(dst))]
+    files = []
+    i = 0
+    while i < len(dirs):
+        src_dir, dst_dir = dirs[i]
+        i += 1
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                target = os.path.join(dst_dir, entry.name)
+                if entry.is_dir():
+                    os.makedirs(target, exist_ok=dirs_exist_ok)
+                    dirs.append((entry.path, target))
+                else:
+                    files.append((entry.path, target))
+
+    if files:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(files)))) as pool:
+            # list() re-raises the first copy error
+            list(pool.map(lambda pair: copy_function(*pair), files))
+
+    for src_dir, dst_dir in reversed(dirs):
+        shutil.copystat(src_dir, dst_dir)
+    return dst
+
+def _remove_path(path: str, is_dir: bool) -> None:
+    if is_dir:
+        shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+def _copy_with_mtime(src: str, dst: str, src_stat: os.stat_result) -> None:
+    fast_copyfile(src, dst)
+    # Keep the source mtime so the next sync sees the file as unchanged
+    os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+
+def sync_tree(src, dst, workers: int = 8) -> tuple[int, int]:
+    """Make dst mirror src, copying only files whose (size, mtime) differ and removing orphans
+
+    Returns (copied, removed). Like parallel_copytree, symlinks in src are followed.
+    """
+    if os.path.lexists(dst) and not os.path.isdir(dst):
+        os.unlink(dst)
+    os.makedirs(dst, exist_ok=True)
+
+    to_copy = []
+    removed = 0
+    pending = [(os.fspath(src), os.fspath(dst))]
+    while pending:
+        src_dir, dst_dir = pending.pop()
+        with os.scandir(src_dir) as it:
+            src_entries = {entry.name: entry for entry in it}
+        with os.scandir(dst_dir) as it:
+            dst_entries = {entry.name: entry for entry in it}
+
+        for name, dst_entry in dst_entries.items():
+            src_entry = src_entries.get(name)
+            dst_is_dir = dst_entry.is_dir(follow_symlinks=False)
+            if src_entry is None or src_entry.is_dir() != dst_is_dir or dst_entry.is_symlink():
+                _remove_path(dst_entry.path, dst_is_dir)
+                dst_entries[name] = None
+                removed += 1
+
+        for name, src_entry in src_entries.items():
+            target = os.path.join(dst_dir, name)
+            if src_entry.is_dir():
+                if dst_entries.get(name) is None:
+                    os.mkdir(target)
+                pending.append((src_entry.path, target))
+                continue
+            src_stat = src_entry.stat()
+            dst_entry = dst_entries.get(name)
+            if dst_entry is not None:
+                dst_stat = dst_entry.stat(follow_symlinks=False)
+                if dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns == src_stat.st_mtime_ns:
+                    continue
+            to_copy.append((src_entry.path, target, src_stat))
+
+    if to_copy:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(to_copy)))) as pool:
+            list(pool.map(lambda item: _copy_with_mtime(*item), to_copy))
+    return len(to_copy), removed
+
 # Get system default encoding
+@lru_cache(maxsize=1)
 def get_system_encoding():
     try:
         return locale.getpreferredencoding()
     except:
         return 'utf-8'
     
+@lru_cache(maxsize=None)
+def _buckyos_sub_root(buckyos_root: str, name: str) -> str:
+    return os.path.join(buckyos_root, name)
+
+def _join_sub_root(name: str, *parts: str) -> str:
+    sub_root = _buckyos_sub_root(get_buckyos_root(), name)
+    if _system_name == "Windows":
+        return os.path.join(sub_root, *parts)
+    return "/".join((sub_root, *parts))
+
 def get_user_data_dir(user_id: str) -> str:
-    return os.path.join(get_buckyos_root(),"data", user_id)
+    return _join_sub_root("data", user_id)
 
 def get_app_data_dir(app_id: str,owner_user_id: str) -> str:
-    return os.path.join(get_buckyos_root(),"data", owner_user_id, app_id)
+    return _join_sub_root("data", owner_user_id, app_id)
 
 def get_app_cache_dir(app_id: str,owner_user_id: str) -> str:
-    return os.path.join(get_buckyos_root(),"cache", owner_user_id, app_id)
+    return _join_sub_root("cache", owner_user_id, app_id)
 
 def get_app_local_cache_dir(app_id: str,owner_user_id: str) -> str:
-    return os.path.join(get_buckyos_root(),"tmp", owner_user_id, app_id)
+    return _join_sub_root("tmp", owner_user_id, app_id)
 
+@lru_cache(maxsize=256)
 def get_session_token_env_key(app_full_id: str, is_app_service: bool) -> str:
     app_id = app_full_id.upper().replace("-", "_")
     if not is_app_service:
@@ -59,88 +246,286 @@ def get_session_token_env_key(app_full_id: str, is_app_service: bool) -> str:
 def get_full_appid(app_id: str, owner_user_id: str) -> str:
     return f"{owner_user_id}-{app_id}"
 
-# TODO: process_full_path is the full path to the target process
-def check_process_exists(process_full_path):
-    if _system_name == "Windows":
-        # Use tasklist command to check process
-        if not process_full_path.endswith(".exe"):
-            process_full_path = process_full_path + ".exe"
-        try:
-            process_name = os.path.basename(process_full_path)
-            check_args = ["tasklist", "/FI", f"IMAGENAME eq {process_name}", "/FO", "CSV"]
-            output = subprocess.check_output(check_args).decode(get_system_encoding(), errors='ignore')
-            # Check if output contains process name (excluding header line)
-            lines = output.strip().split('\n')
-            if len(lines) > 1:  # Has data rows
-                return True
-            return False
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            # If tasklist fails, try wmic (for compatibility)
+def _read_proc_cmdlines() -> list[str] | None:
+    """Read every process command line from /proc, the same source pgrep -f uses.
+
+    Returns None when /proc is not available so callers can fall back to `ps`.
+    """
+    try:
+        entries = os.scandir("/proc")
+    except OSError:
+        return None
+    lines = []
+    with entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
             try:
-                check_args = ["wmic", "process", "where", f"ExecutablePath like '%{process_full_path}%'", "get", "ProcessId", "/format:list"]
-                output = subprocess.check_output(check_args).decode(get_system_encoding(), errors='ignore')
-                return bool(output.strip())
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                print(f"Warning: Unable to check process existence on Windows. Both tasklist and wmic failed.")
-                return False
-    else:
-        # pgrep with -f option can match full command line including complete path
-        # If process_full_path is a process name, match directly
-        # If it's a full path, use -f option for pattern matching
-        check_args = ["pgrep", "-f", process_full_path]
+                with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                    cmdline = f.read()
+            except OSError:
+                # The process exited or is not readable
+                continue
+            if cmdline:
+                lines.append(cmdline.rstrip(b"\0").replace(b"\0", b" ").decode(errors="ignore"))
+    return lines
+
+class ProcessSnapshot:
+    """One `ps`/`tasklist` listing shared by many process checks.
+
+    The listing is refreshed at most once per `ttl` seconds, so loops that
+    probe many processes pay for a single subprocess instead of one per probe.
+    """
 
+    def __init__(self, ttl: float = 0.5):
+        self.ttl = ttl
+        self._refreshed_at: float | None = None
+        self._lines: list[str] = []
+
+    def refresh(self) -> None:
+        proc_lines = _read_proc_cmdlines() if _system_name == "Linux" else None
+        if proc_lines is not None:
+            self._lines = proc_lines
+            self._refreshed_at = time.monotonic()
+            return
+
+        if _system_name == "Windows":
+            check_args = ["tasklist", "/FO", "CSV", "/NH"]
+        else:
+            check_args = ["ps", "-eo", "pid,args"]
         try:
-            output = subprocess.check_output(check_args).decode()
-            #print(f"check_process_exists {process_name} output: {output}")
-            return bool(output.strip())  # If output is not empty, process exists
-        except subprocess.CalledProcessError:
-            return False
-
-def check_port(port) -> bool:
-    if port == 0:
-        return True
-    import socket
+            # tasklist prints in the console code page, so decode with the locale encoding
+            output = subprocess.check_output(check_args, encoding=get_system_encoding(), errors='ignore')
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            print(f"Warning: Unable to list processes with {check_args[0]}.")
+            output = ""
+        if _system_name == "Windows":
+            # Keep only the image name column, lower-cased for case-insensitive matching
+            self._lines = [row[0].lower() for row in csv.reader(output.splitlines()) if row]
+        else:
+            # Drop the header line and the pid column, keep the full command line
+            self._lines = [line.strip().split(None, 1)[-1] for line in output.splitlines()[1:] if line.strip()]
+        self._refreshed_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Drop the cached listing so the next check lists processes again"""
+        self._refreshed_at = None
+
+    def maybe_refresh(self) -> None:
+        if self._refreshed_at is None or time.monotonic() - self._refreshed_at > self.ttl:
+            self.refresh()
+
+    def contains(self, process_full_path) -> bool:
+        self.maybe_refresh()
+        if _system_name == "Windows":
+            process_name = os.path.basename(process_full_path).lower()
+            return process_name in self._lines
+        return any(process_full_path in line for line in self._lines)
+
+_PROC_SNAPSHOT = ProcessSnapshot()
+
+# TODO: process_full_path is the full path to the target process
+def check_process_exists(process_full_path, snapshot: ProcessSnapshot | None = None):
+    """Check whether a process matching process_full_path is running.
+
+    On Windows the image name is matched, elsewhere the full command line is
+    searched, like `pgrep -f`. Pass a shared `snapshot` (or rely on the module
+    default) to answer many checks from one process listing.
+    """
+    if snapshot is None:
+        snapshot = _PROC_SNAPSHOT
+    if _system_name == "Windows" and not process_full_path.endswith(".exe"):
+        process_full_path = process_full_path + ".exe"
+    return snapshot.contains(process_full_path)
+
+def check_ports(ports, timeout: float = 0.1) -> dict[int, bool]:
+    """Probe several local TCP ports at once.
+
+    All connects are started non-blocking and awaited with a single selector,
+    so the total wait is bounded by `timeout` rather than by the port count.
+    """
+    results: dict[int, bool] = {}
+    pending: dict[socket.socket, int] = {}
+    sel = selectors.DefaultSelector()
+    try:
+        for port in ports:
+            if port == 0:
+                results[port] = True
+                continue
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            err = sock.connect_ex(('127.0.0.1', port))
+            if err in (0, errno.EISCONN):
+                results[port] = True
+                sock.close()
+            elif err in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY):
+                sel.register(sock, selectors.EVENT_WRITE)
+                pending[sock] = port
+            else:
+                results[port] = False
+                sock.close()
+
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in sel.select(remaining):
+                sock = key.fileobj
+                port = pending.pop(sock)
+                results[port] = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                sel.unregister(sock)
+                sock.close()
+    finally:
+        for sock, port in pending.items():
+            results[port] = False
+            sock.close()
+        sel.close()
+    return results
+
+def check_port(port, timeout: float = 0.1) -> bool:
+    return check_ports([port], timeout)[port]
+
+# The kernel keeps only this many characters of a process name (comm)
+_COMM_MAX_LEN = 15
+_ERE_SPECIAL_CHARS = set(".[]()*+?{}|^$\\")
+
+def _read_proc_pids_by_name(name) -> list[int] | None:
+    """Find pids whose name is `name` by reading /proc, the way killall does.
+
+    comm is truncated to 15 characters, so longer names are also checked
+    against the basename of argv[0]. Returns None when /proc is not available.
+    """
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(1)
-        sock.connect(('localhost', port))
-        sock.close()
-        return True
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return False
+        entries = os.scandir("/proc")
+    except OSError:
+        return None
+    own_pid = os.getpid()
+    pids = []
+    with entries:
+        for entry in entries:
+            if not entry.name.isdigit() or int(entry.name) == own_pid:
+                continue
+            try:
+                with open(f"/proc/{entry.name}/comm", "rb") as f:
+                    comm = f.read().rstrip(b"\n").decode(errors="ignore")
+                if comm != name:
+                    if len(name) <= _COMM_MAX_LEN or comm != name[:_COMM_MAX_LEN]:
+                        continue
+                    with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                        argv0 = f.read().split(b"\0", 1)[0].decode(errors="ignore")
+                    if os.path.basename(argv0) != name:
+                        continue
+            except OSError:
+                # The process exited or is not readable
+                continue
+            pids.append(int(entry.name))
+    return pids
+
+def _find_pids_by_name(name) -> list[int]:
+    if _system_name == "Linux":
+        pids = _read_proc_pids_by_name(name)
+        if pids is not None:
+            return pids
+    if len(name) <= _COMM_MAX_LEN:
+        # pgrep -x matches the exact process name, the same way killall does
+        pgrep_args = ["pgrep", "-x", name]
+    else:
+        # pgrep -x never matches a name longer than comm, match the executable in argv[0] instead
+        pattern = "".join("\\" + c if c in _ERE_SPECIAL_CHARS else c for c in name)
+        pgrep_args = ["pgrep", "-f", f"(^|/){pattern}( |$)"]
+    result = subprocess.run(pgrep_args, capture_output=True, text=True)
+    if result.returncode != 0:
+        return []
+    return [int(pid) for pid in result.stdout.split() if pid.isdigit()]
 
 def kill_process(name):
-    killall_command = "killall"
+    process_name = get_execute_name(name)
     if _system_name == "Windows":
-        killall_command = "taskkill /F /IM"
+        result = subprocess.run(["taskkill", "/F", "/IM", process_name], capture_output=True)
+        killed = result.returncode == 0
+    else:
+        killed = False
+        for pid in _find_pids_by_name(process_name):
+            try:
+                os.kill(pid, signal.SIGTERM)
+                killed = True
+            except ProcessLookupError:
+                pass
 
-    if os.system(f"{killall_command} {get_execute_name(name)}") != 0:
+    # The process table just changed, don't answer the next check from the old listing
+    _PROC_SNAPSHOT.invalidate()
+    if not killed:
         print(f"{name} not running")
     else:
         print(f"{name} killed")
 
-def nohup_start(run_cmd, env_vars=None):
-    cmd = f"nohup {run_cmd} > /dev/null 2>&1 &"
+# Processes started by nohup_start, keyed by pid, so they can be waited on
+# directly instead of polling the process table.
+_children: dict[int, subprocess.Popen] = {}
+
+def _reap_children() -> None:
+    # Popen.poll() only waits on its own pid, so unrelated subprocess calls are unaffected
+    for pid, process in list(_children.items()):
+        if process.poll() is not None:
+            del _children[pid]
+
+def wait_process(process: subprocess.Popen, timeout: float | None = None) -> int | None:
+    """Wait for a process returned by nohup_start.
+
+    Returns its exit code, or None if it is still running after `timeout` seconds.
+    """
+    try:
+        returncode = process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        return None
+    _children.pop(process.pid, None)
+    return returncode
+
+def nohup_start(run_cmd: list[str] | str, env_vars=None) -> subprocess.Popen:
+    """Start run_cmd detached from the current process, discarding its output.
+
+    run_cmd may be an argv list or a command line string; the process is
+    spawned directly, without an intermediate shell. The returned handle can be
+    passed to wait_process.
+    """
     creationflags = 0
+    start_new_session = True
     if _system_name == "Windows":
-        cmd = f"start /min {run_cmd}"
+        # CreateProcess takes the command line as-is, no need to split it
         creationflags = subprocess.DETACHED_PROCESS|subprocess.CREATE_NEW_PROCESS_GROUP|subprocess.CREATE_NO_WINDOW
-    print(f"will run cmd {cmd} on system {_system_name}")
+        start_new_session = False
+    elif isinstance(run_cmd, str):
+        run_cmd = shlex.split(run_cmd)
+    print(f"will run cmd {run_cmd} on system {_system_name}")
     
     # Create environment variables dictionary
     env = os.environ.copy()
     if env_vars:
         env.update(env_vars)
     
-    subprocess.run(cmd, shell=True, creationflags=creationflags, env=env)
-    # os.system(cmd)
+    _reap_children()
+    process = subprocess.Popen(
+        run_cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        creationflags=creationflags,
+        start_new_session=start_new_session,
+        env=env,
+    )
+    _children[process.pid] = process
+    _PROC_SNAPSHOT.invalidate()
+    return process
 
 def get_buckyos_root():
     buckyos_root = os.environ.get("BUCKYOS_ROOT")
     if buckyos_root:
         return buckyos_root
+    return _default_buckyos_root()
 
+@lru_cache(maxsize=1)
+def _default_buckyos_root():
     if _system_name == "Windows":
         user_data_dir = os.environ.get("APPDATA")
         if not user_data_dir:
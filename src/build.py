@@ -1,3 +1,4 @@
+import argparse
 import sys
 import platform
 from pathlib import Path
@@ -41,6 +42,38 @@ def _print_build_help() -> None:
     print(BUILD_HELP)
 
 
+def _build_arg_parser() -> argparse.ArgumentParser:
+    # Help is served from BUILD_HELP; unknown arguments (including the amd64/aarch64
+    # positionals) are left to the caller via parse_known_args.
+    parser = argparse.ArgumentParser(prog="buckyos-build", add_help=False, allow_abbrev=False)
+    parser.add_argument("--skip-web", action="store_true")
+    parser.add_argument("--timings", action="store_true")
+    parser.add_argument("--timings-dir")
+    parser.add_argument("--app", action="append", nargs="+")
+    parser.add_argument("-s", "--select", action="append", nargs="*")
+    parser.add_argument("--target")
+    return parser
+
+
+_BUILD_ARG_PARSER = _build_arg_parser()
+
+# Positional shortcuts accepted by buckyos-build
+_TARGET_ALIASES = {
+    "amd64": "x86_64-unknown-linux-musl",
+    "aarch64": "aarch64-unknown-linux-musl",
+}
+
+# (platform.system(), platform.machine()) => default Rust target
+_HOST_DEFAULT_TARGETS = {
+    ("Linux", "x86_64"): "x86_64-unknown-linux-musl",
+    ("Linux", "AMD64"): "x86_64-unknown-linux-musl",
+    ("Windows", "x86_64"): "x86_64-pc-windows-msvc",
+    ("Windows", "AMD64"): "x86_64-pc-windows-msvc",
+    ("Darwin", "arm64"): "aarch64-apple-darwin",
+    ("Darwin", "arm"): "aarch64-apple-darwin",
+}
+
+
 def _prompt_select_modules_line(selectable: list[tuple[str, str]]) -> set[str]:
     print("Select modules to build (answer y to include):")
     selected = set()
@@ -64,56 +97,72 @@ def _prompt_select_modules_interactive(selectable: list[tuple[str, str]]) -> set
 
     cancel_token = object()
 
+    lines = [f"{module_name} ({module_type})" for module_name, module_type in selectable]
+    header = "Select modules to build: up/down move, space toggle, Enter confirm"
+
     def _run(stdscr):
         curses.curs_set(0)
         stdscr.keypad(True)
         selected_flags = [False] * len(selectable)
         index = 0
-        while True:
-            stdscr.clear()
+        start = 0
+
+        def draw_row(i):
+            max_x = stdscr.getmaxyx()[1]
+            row = i - start + 2
+            prefix = "[*]" if selected_flags[i] else "[ ]"
+            attr = curses.A_REVERSE if i == index else curses.A_NORMAL
+            stdscr.move(row, 0)
+            stdscr.clrtoeol()
+            stdscr.addnstr(row, 0, f"{prefix} {lines[i]}", max_x - 1, attr)
+
+        def redraw_all():
+            stdscr.erase()
             max_y, max_x = stdscr.getmaxyx()
             if max_y < 4 or max_x < 20:
-                return None
-            header = "Select modules to build: up/down move, space toggle, Enter confirm"
+                return False
             try:
-                stdscr.addstr(0, 0, header[: max_x - 1])
+                stdscr.addnstr(0, 0, header, max_x - 1)
             except curses.error:
-                return None
+                return False
+            for i in range(start, min(start + max_y - 2, len(selectable))):
+                draw_row(i)
+            return True
 
-            visible_rows = max_y - 2
-            start = 0
-            if index >= start + visible_rows:
-                start = index - visible_rows + 1
-            if index < start:
-                start = index
-
-            for row in range(visible_rows):
-                i = start + row
-                if i >= len(selectable):
-                    break
-                module_name, module_type = selectable[i]
-                prefix = "[*]" if selected_flags[i] else "[ ]"
-                line = f"{prefix} {module_name} ({module_type})"
-                line = line[: max_x - 1]
-                if i == index:
-                    stdscr.attron(curses.A_REVERSE)
-                    stdscr.addstr(row + 2, 0, line)
-                    stdscr.attroff(curses.A_REVERSE)
-                else:
-                    stdscr.addstr(row + 2, 0, line)
+        if not redraw_all():
+            return None
+        while True:
             stdscr.refresh()
-
             key = stdscr.getch()
+            prev_index = index
             if key in (curses.KEY_UP, ord("k")):
                 index = (index - 1) % len(selectable)
             elif key in (curses.KEY_DOWN, ord("j")):
                 index = (index + 1) % len(selectable)
             elif key == ord(" "):
                 selected_flags[index] = not selected_flags[index]
+                draw_row(index)
+                continue
             elif key in (curses.KEY_ENTER, 10, 13):
                 return selected_flags
             elif key in (27, ord("q")):
                 return cancel_token
+            elif key != curses.KEY_RESIZE:
+                continue
+
+            # Only the two rows whose highlight changed are redrawn, unless the view
+            # scrolled or the terminal was resized.
+            visible_rows = max(stdscr.getmaxyx()[0] - 2, 1)
+            if index >= start + visible_rows:
+                start = index - visible_rows + 1
+            elif index < start:
+                start = index
+            elif key != curses.KEY_RESIZE:
+                draw_row(prev_index)
+                draw_row(index)
+                continue
+            if not redraw_all():
+                return None
 
     try:
         flags = curses.wrapper(_run)
@@ -215,7 +264,6 @@ def build(
     copy_build_results(project, skip_web_module, rust_target, None if selected_modules is None else list(selected_modules))
 
 def build_main(argv: list[str] | None = None):
-    skip_web_module = False
     args = sys.argv[1:] if argv is None else list(argv)
     if _has_help_arg(args):
         _print_build_help()
@@ -224,98 +272,44 @@ def build_main(argv: list[str] | None = None):
     system = platform.system() # Linux / Windows / Darwin
     arch = platform.machine() # x86_64 / AMD64 / arm64 / arm
     print(f"DEBUG: system:{system},arch:{arch}")
-    target = ""
     select_mode = False
     selected_modules = None
     app_names: list[str] = []
-    timings = False
     timings_dir: Path | None = None
-    if system == "Linux" and (arch == "x86_64" or arch == "AMD64"):
-        target = "x86_64-unknown-linux-musl"
-    elif system == "Windows" and (arch == "x86_64" or arch == "AMD64"):
-        target = "x86_64-pc-windows-msvc"
-#     elif system == "Linux" and (arch == "x86_64" or arch == "AMD64"):
-#         target = "aarch64-unknown-linux-gnu"
-    elif system == "Darwin" and (arch == "arm64" or arch == "arm"):
-        target = "aarch64-apple-darwin"
+    target = _HOST_DEFAULT_TARGETS.get((system, arch), "")
 
-    i = 0
-    while i < len(args):
-        arg = args[i]
-        if arg == "--skip-web":
-            skip_web_module = True
-            i += 1
-            continue
-        if arg == "--timings":
-            timings = True
-            i += 1
-            continue
-        if arg == "--timings-dir":
-            if i + 1 >= len(args) or args[i + 1].startswith("-"):
-                print("Error: --timings-dir requires a directory")
-                sys.exit(1)
-            timings = True
-            timings_dir = Path(args[i + 1])
-            i += 2
-            continue
-        if arg.startswith("--timings-dir="):
-            value = arg.split("=", 1)[1]
-            if not value:
-                print("Error: --timings-dir requires a directory")
-                sys.exit(1)
-            timings = True
-            timings_dir = Path(value)
-            i += 1
-            continue
-        if arg == "--app":
-            apps = []
-            j = i + 1
-            while j < len(args) and not args[j].startswith("-"):
-                apps.extend(_split_option_values(args[j]))
-                j += 1
-            if not apps:
-                print("Error: --app requires at least one app name")
-                sys.exit(1)
-            app_names.extend(apps)
-            i = j
-            continue
-        if arg.startswith("--app="):
-            apps = _split_option_values(arg.split("=", 1)[1])
-            if not apps:
-                print("Error: --app requires at least one app name")
-                sys.exit(1)
-            app_names.extend(apps)
-            i += 1
-            continue
-        if arg == "--select" or arg == "-s":
-            # Examples: "-s mod_a mod_b" builds those modules; "-s" enters interactive selection.
-            modules = []
-            j = i + 1
-            while j < len(args) and not args[j].startswith("-"):
-                modules.append(args[j])
-                j += 1
-            if modules:
-                if selected_modules is None:
-                    selected_modules = set(modules)
-                else:
-                    selected_modules.update(modules)
-            elif selected_modules is None:
-                select_mode = True
-            i = j
-            continue
-        if arg == "amd64":
-            target = "x86_64-unknown-linux-musl"
-            i += 1
-            continue
-        if arg == "aarch64":
-            target = "aarch64-unknown-linux-musl"
-            i += 1
-            continue
-        if arg.startswith("--target="):
-            target = arg.split("=", 1)[1]
-            i += 1
-            continue
-        i += 1
+    ns, extra_args = _BUILD_ARG_PARSER.parse_known_args(args)
+
+    skip_web_module = ns.skip_web
+    timings = ns.timings
+    if ns.timings_dir is not None:
+        if not ns.timings_dir:
+            print("Error: --timings-dir requires a directory")
+            sys.exit(1)
+        timings = True
+        timings_dir = Path(ns.timings_dir)
+
+    for value in ns.app or []:
+        apps = [app for item in value for app in _split_option_values(item)]
+        if not apps:
+            print("Error: --app requires at least one app name")
+            sys.exit(1)
+        app_names.extend(apps)
+
+    # Examples: "-s mod_a mod_b" builds those modules; "-s" enters interactive selection.
+    for modules in ns.select or []:
+        if modules:
+            if selected_modules is None:
+                selected_modules = set(modules)
+            else:
+                selected_modules.update(modules)
+        elif selected_modules is None:
+            select_mode = True
+
+    for arg in extra_args:
+        target = _TARGET_ALIASES.get(arg, target)
+    if ns.target is not None:
+        target = ns.target
 
     # Load project configuration
     # Load project configuration
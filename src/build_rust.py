@@ -1,4 +1,5 @@
 
+import glob
 import os
 import shlex
 import tempfile
@@ -7,10 +8,13 @@ import subprocess
 import platform
 import shutil
 import re
-from datetime import datetime
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional,Dict
 
+from .buckyos_kit import nohup_start
 from .project import BuckyProject, RustModuleInfo
 
 _MUSL_TOOL_ENV_SUFFIXES = {
@@ -20,16 +24,21 @@ _MUSL_TOOL_ENV_SUFFIXES = {
     "RANLIB": "ranlib",
 }
 
+@lru_cache(maxsize=None)
+def _tool_exists(name: str) -> bool:
+    return shutil.which(name) is not None
+
+@lru_cache(maxsize=1)
 def check_musl_gcc():
     _resolve_musl_toolchain("x86_64-unknown-linux-musl", get_host_target())
 
 def check_aarch64_toolchain():
-    if shutil.which('aarch64-linux-gnu-gcc') is None:
+    if not _tool_exists('aarch64-linux-gnu-gcc'):
         print("Error: aarch64-linux-gnu-gcc not found. Please install gcc-aarch64-linux-gnu.")
         sys.exit(1)
 
 def _git_output(base_dir: str, args: list[str]) -> Optional[str]:
-    if shutil.which("git") is None:
+    if not _tool_exists("git"):
         return None
     result = subprocess.run(
         ["git", *args],
@@ -42,35 +51,88 @@ def _git_output(base_dir: str, args: list[str]) -> Optional[str]:
         return None
     return result.stdout.strip()
 
-def get_build_metadata(base_dir: str) -> Dict[str, str]:
-    now = datetime.utcnow()
+_UNKNOWN_GIT_METADATA = {
+    "BUCKYOS_GIT_COMMIT": "unknown",
+    "BUCKYOS_GIT_BRANCH": "unknown",
+    "BUCKYOS_GIT_DESCRIBE": "unknown",
+    "BUCKYOS_GIT_DIRTY": "0",
+}
+
+def _pygit2_metadata(base_dir: str, need_dirty: bool = True) -> Optional[Dict[str, str]]:
+    # Reads git metadata in-process through libgit2; None means "use the git binary instead"
+    try:
+        import pygit2
+    except ImportError:
+        return None
+
+    try:
+        repo_path = pygit2.discover_repository(base_dir)
+        if repo_path is None:
+            return dict(_UNKNOWN_GIT_METADATA)
+        repo = pygit2.Repository(repo_path)
+        if repo.is_bare or repo.head_is_unborn:
+            return None
+
+        describe_options = {"dirty_suffix": "-dirty"} if need_dirty else {}
+        describe = repo.describe(
+            describe_strategy=pygit2.GIT_DESCRIBE_TAGS,
+            show_commit_oid_as_fallback=True,
+            **describe_options,
+        )
+        return {
+            "BUCKYOS_GIT_COMMIT": str(repo.head.target)[:12],
+            "BUCKYOS_GIT_BRANCH": "HEAD" if repo.head_is_detached else repo.head.shorthand,
+            "BUCKYOS_GIT_DESCRIBE": describe,
+            "BUCKYOS_GIT_DIRTY": "1" if need_dirty and describe.endswith("-dirty") else "0",
+        }
+    except (pygit2.GitError, KeyError, ValueError) as e:
+        print(f"Warning: pygit2 failed to read {base_dir}: {e}, falling back to git")
+        return None
+
+def _git_cli_metadata(base_dir: str, need_dirty: bool = True) -> Dict[str, str]:
+    # One rev-parse answers "inside a work tree?", the HEAD commit and the branch name
+    rev_parse = _git_output(base_dir, ["rev-parse", "--is-inside-work-tree", "HEAD", "--abbrev-ref", "HEAD"])
+    rev_lines = rev_parse.splitlines() if rev_parse else []
+    if len(rev_lines) != 3 or rev_lines[0] != "true":
+        return dict(_UNKNOWN_GIT_METADATA)
+
+    # `describe --dirty` already compares tracked files against HEAD, so its suffix doubles
+    # as the dirty flag instead of walking the whole worktree with `git status`
+    describe_args = ["describe", "--tags", "--always"]
+    if need_dirty:
+        describe_args.append("--dirty")
+    describe = _git_output(base_dir, describe_args)
+
+    return {
+        "BUCKYOS_GIT_COMMIT": rev_lines[1][:12] or "unknown",
+        "BUCKYOS_GIT_BRANCH": rev_lines[2] or "unknown",
+        "BUCKYOS_GIT_DESCRIBE": describe or "unknown",
+        "BUCKYOS_GIT_DIRTY": "1" if need_dirty and describe and describe.endswith("-dirty") else "0",
+    }
+
+def get_build_metadata(base_dir: str, need_dirty: bool = True) -> Dict[str, str]:
+    # Copy so callers can't mutate the memoized result
+    return dict(_cached_build_metadata(base_dir, need_dirty))
+
+# Multi-target builds in one process reuse the git probe (and one consistent build timestamp)
+@lru_cache(maxsize=8)
+def _cached_build_metadata(base_dir: str, need_dirty: bool) -> Dict[str, str]:
+    timestamp = datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
     env = {
-        "BUCKYOS_BUILD_DATE": now.strftime("%Y-%m-%d"),
-        "BUCKYOS_BUILD_TIMESTAMP": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "BUCKYOS_BUILD_DATE": timestamp[:10],
+        "BUCKYOS_BUILD_TIMESTAMP": timestamp,
     }
 
-    in_repo = _git_output(base_dir, ["rev-parse", "--is-inside-work-tree"])
-    if in_repo != "true":
-        env.update({
-            "BUCKYOS_GIT_COMMIT": "unknown",
-            "BUCKYOS_GIT_BRANCH": "unknown",
-            "BUCKYOS_GIT_DESCRIBE": "unknown",
-            "BUCKYOS_GIT_DIRTY": "0",
-        })
-        return env
-
-    env.update({
-        "BUCKYOS_GIT_COMMIT": _git_output(base_dir, ["rev-parse", "--short=12", "HEAD"]) or "unknown",
-        "BUCKYOS_GIT_BRANCH": _git_output(base_dir, ["rev-parse", "--abbrev-ref", "HEAD"]) or "unknown",
-        "BUCKYOS_GIT_DESCRIBE": _git_output(base_dir, ["describe", "--tags", "--always", "--dirty"]) or "unknown",
-    })
-    dirty = _git_output(base_dir, ["status", "--porcelain"])
-    env["BUCKYOS_GIT_DIRTY"] = "1" if dirty else "0"
+    git_env = _pygit2_metadata(base_dir, need_dirty)
+    if git_env is None:
+        git_env = _git_cli_metadata(base_dir, need_dirty)
+    env.update(git_env)
     return env
 
+_VERSION_TOKEN_RE = re.compile(r"[^0-9A-Za-z._-]+")
+
 def _sanitize_version_token(value: str) -> str:
-    token = re.sub(r"[^0-9A-Za-z._-]+", "-", value).strip("-.")
-    return token or "unknown"
+    return _VERSION_TOKEN_RE.sub("-", value).strip("-.") or "unknown"
 
 def make_version_extend(build_env: Dict[str, str]) -> str:
     branch = build_env.get("BUCKYOS_GIT_BRANCH", "unknown")
@@ -83,18 +145,85 @@ def make_version_extend(build_env: Dict[str, str]) -> str:
     suffix = _sanitize_version_token(".".join(parts))
     return suffix
 
-def clean_rust_build(project: BuckyProject):
-    print(f"Cleaning build artifacts at ${project.rust_target_dir}")
-    subprocess.run(["cargo", "clean", "--target-dir", project.rust_target_dir], check=True, cwd=project.rust_target_dir)
+def clean_rust_build(project: BuckyProject, packages: list[str] | None = None):
+    """Clean Rust build artifacts
+
+    With packages, only those crates are cleaned through cargo. A full clean renames the
+    target dir aside and deletes it in a detached process, so a following build can start
+    right away against a fresh target dir. Leftovers of earlier full cleans are swept in
+    the same pass; if the rename fails (e.g. a file is open on Windows), cargo cleans in place.
+    """
+    target_dir = _resolve_rust_target_dir(project)
+    print(f"Cleaning build artifacts at {target_dir}")
+    cargo_args = ["cargo", "clean", "--target-dir", str(target_dir)]
+    if packages:
+        for package in packages:
+            cargo_args.extend(["-p", package])
+        subprocess.run(cargo_args, check=True, cwd=project.base_dir)
+        return
+
+    trash_dirs = sorted(target_dir.parent.glob(f"{glob.escape(target_dir.name)}.old-*"))
+    for leftover in trash_dirs:
+        print(f"Warning: {leftover} was left by an earlier clean, removing it")
+    if target_dir.exists():
+        trash_dir = target_dir.with_name(f"{target_dir.name}.old-{uuid.uuid4().hex[:8]}")
+        try:
+            os.rename(target_dir, trash_dir)
+            trash_dirs.append(trash_dir)
+        except OSError as e:
+            print(f"Warning: unable to move {target_dir} aside ({e}), running cargo clean")
+            subprocess.run(cargo_args, check=True, cwd=project.base_dir)
+    if trash_dirs:
+        nohup_start([
+            sys.executable, "-c",
+            "import shutil, sys\nfor path in sys.argv[1:]: shutil.rmtree(path, ignore_errors=True)",
+            *map(str, trash_dirs),
+        ])
+
+# Cargo fingerprints the literal RUSTFLAGS string, so each target always gets the same one
+_RUSTFLAGS_BY_TARGET: Dict[str, str] = {
+    "x86_64-unknown-linux-musl": "-C target-feature=+crt-static",
+    "aarch64-unknown-linux-gnu": "-C target-feature=+crt-static",
+}
+
+# (target_arch, host_arch) => gnu cross toolchain env; host_arch None matches any host
+_LINUX_GNU_CROSS_ENV_VARS: Dict[tuple[str, Optional[str]], Dict[str, str]] = {
+    # x86_64 -> aarch64 Linux
+    ("aarch64", "x86_64"): {
+        "CC_aarch64_unknown_linux_gnu": "aarch64-linux-gnu-gcc",
+        "CXX_aarch64_unknown_linux_gnu": "aarch64-linux-gnu-g++",
+        "AR_aarch64_unknown_linux_gnu": "aarch64-linux-gnu-ar",
+        "CARGO_TARGET_AARCH64_UNKNOWN_LINUX_GNU_LINKER": "aarch64-linux-gnu-gcc",
+    },
+    # aarch64 -> x86_64 Linux
+    ("x86_64", "aarch64"): {
+        "CC_x86_64_unknown_linux_gnu": "x86_64-linux-gnu-gcc",
+        "CXX_x86_64_unknown_linux_gnu": "x86_64-linux-gnu-g++",
+        "AR_x86_64_unknown_linux_gnu": "x86_64-linux-gnu-ar",
+        "CARGO_TARGET_X86_64_UNKNOWN_LINUX_GNU_LINKER": "x86_64-linux-gnu-gcc",
+    },
+    # -> armv7 Linux
+    ("armv7", None): {
+        "CC_armv7_unknown_linux_gnueabihf": "arm-linux-gnueabihf-gcc",
+        "CXX_armv7_unknown_linux_gnueabihf": "arm-linux-gnueabihf-g++",
+        "AR_armv7_unknown_linux_gnueabihf": "arm-linux-gnueabihf-ar",
+        "CARGO_TARGET_ARMV7_UNKNOWN_LINUX_GNUEABIHF_LINKER": "arm-linux-gnueabihf-gcc",
+    },
+}
 
 def get_env_vars_by_target(target: str) -> Dict[str, str]:
-    env_vars = {}
-    if target == "x86_64-unknown-linux-musl":
-        env_vars["RUSTFLAGS"] = "-C target-feature=+crt-static"
-    elif target == "aarch64-unknown-linux-gnu":
-        env_vars["RUSTFLAGS"] = "-C target-feature=+crt-static"
-    return env_vars
+    rustflags = _RUSTFLAGS_BY_TARGET.get(target)
+    return {"RUSTFLAGS": rustflags} if rustflags else {}
+
+def canonical_rustflags(*flag_strings: str) -> str:
+    """Join RUSTFLAGS strings in the given order with normalized spacing
+
+    cargo fingerprints the literal string, so equal inputs always give the same result.
+    Every token is kept in place: order and repeats matter for -l/-L/link-arg flags.
+    """
+    return " ".join(" ".join(flag_strings).split())
 
+@lru_cache(maxsize=1)
 def get_host_target() -> str:
     """Get the Rust target triple for the current host"""
     machine = platform.machine().lower()
@@ -132,6 +261,7 @@ def get_host_target() -> str:
     # Fallback: return as-is
     return f'{arch}-unknown-{system}'
 
+@lru_cache(maxsize=64)
 def parse_rust_target(target: str) -> tuple[str, str]:
     """Parse Rust target triple to extract arch and OS
     
@@ -199,7 +329,7 @@ def _get_musl_tool_candidates(target_arch: str, tool_suffix: str, host_arch: str
 
 def _resolve_first_tool(candidates: list[str]) -> Optional[str]:
     for tool in candidates:
-        if shutil.which(tool) is not None:
+        if _tool_exists(tool):
             return tool
     return None
 
@@ -380,26 +510,13 @@ def get_cross_compile_env_vars_by_target(target: str) -> Optional[Dict[str, str]
     if target_os == 'linux':
         if 'musl' in target:
             env_vars.update(_resolve_musl_toolchain(target, cross_compile_context["host_target"]))
-        elif target_arch == 'aarch64' and host_arch == 'x86_64':
-            # x86_64 -> aarch64 Linux
-            env_vars["CC_aarch64_unknown_linux_gnu"] = "aarch64-linux-gnu-gcc"
-            env_vars["CXX_aarch64_unknown_linux_gnu"] = "aarch64-linux-gnu-g++"
-            env_vars["AR_aarch64_unknown_linux_gnu"] = "aarch64-linux-gnu-ar"
-            env_vars["CARGO_TARGET_AARCH64_UNKNOWN_LINUX_GNU_LINKER"] = "aarch64-linux-gnu-gcc"
-            
-        elif target_arch == 'x86_64' and host_arch == 'aarch64':
-            # aarch64 -> x86_64 Linux
-            env_vars["CC_x86_64_unknown_linux_gnu"] = "x86_64-linux-gnu-gcc"
-            env_vars["CXX_x86_64_unknown_linux_gnu"] = "x86_64-linux-gnu-g++"
-            env_vars["AR_x86_64_unknown_linux_gnu"] = "x86_64-linux-gnu-ar"
-            env_vars["CARGO_TARGET_X86_64_UNKNOWN_LINUX_GNU_LINKER"] = "x86_64-linux-gnu-gcc"
-            
-        elif target_arch == 'armv7':
-            # -> armv7 Linux
-            env_vars["CC_armv7_unknown_linux_gnueabihf"] = "arm-linux-gnueabihf-gcc"
-            env_vars["CXX_armv7_unknown_linux_gnueabihf"] = "arm-linux-gnueabihf-g++"
-            env_vars["AR_armv7_unknown_linux_gnueabihf"] = "arm-linux-gnueabihf-ar"
-            env_vars["CARGO_TARGET_ARMV7_UNKNOWN_LINUX_GNUEABIHF_LINKER"] = "arm-linux-gnueabihf-gcc"
+        else:
+            gnu_env_vars = _LINUX_GNU_CROSS_ENV_VARS.get(
+                (target_arch, host_arch),
+                _LINUX_GNU_CROSS_ENV_VARS.get((target_arch, None)),
+            )
+            if gnu_env_vars:
+                env_vars.update(gnu_env_vars)
     
     return env_vars
 
@@ -443,6 +560,56 @@ def _copy_timing_reports(
         shutil.copy2(report, target_file)
         print(f"Copied Cargo timings report: {report} => {target_file}")
 
+def _needs_git_dirty(project: BuckyProject) -> bool:
+    # The probed dirty flag is only visible through BUCKYOS_GIT_DIRTY and VERSION_EXTEND;
+    # skip it when both are pinned (e.g. release builds)
+    dirty_pinned = "BUCKYOS_GIT_DIRTY" in os.environ or "BUCKYOS_GIT_DIRTY" in project.rust_env
+    return not (dirty_pinned and "VERSION_EXTEND" in project.rust_env)
+
+# With BUCKYOS_MINIMAL_CARGO_ENV=1 only these caller variables are forwarded to cargo;
+# by default the whole environment is, since build scripts read all kinds of variables.
+# Names are compared upper-cased since Windows environment names are case-insensitive.
+_CARGO_ENV_ALLOWLIST = frozenset({
+    "PATH", "HOME", "USER", "LOGNAME", "SHELL", "TERM", "TZ", "LANG", "TMPDIR", "TEMP", "TMP",
+    "CFLAGS", "CXXFLAGS", "CPPFLAGS", "LDFLAGS", "LD_LIBRARY_PATH", "LIBRARY_PATH", "SDKROOT",
+    "HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY", "ALL_PROXY", "SSH_AUTH_SOCK",
+    "SYSTEMROOT", "SYSTEMDRIVE", "WINDIR", "COMSPEC", "PATHEXT", "OS", "USERPROFILE", "APPDATA",
+    "LOCALAPPDATA", "PROGRAMDATA", "PROGRAMFILES", "PROGRAMFILES(X86)", "NUMBER_OF_PROCESSORS",
+    "PROCESSOR_ARCHITECTURE", "INCLUDE", "LIB", "LIBPATH", "DEVELOPER_DIR",
+})
+# Includes the knobs read by cc-rs (CFLAGS_<target>, TARGET_CC, HOST_CC), bindgen/clang-sys,
+# prost-build (PROTOC) and the cmake crate, which native deps like rocksdb rely on
+_CARGO_ENV_PREFIXES = (
+    "CARGO_", "RUST", "CC", "CXX", "AR_", "BUCKYOS_", "SCCACHE_", "PKG_CONFIG", "OPENSSL_",
+    "LC_", "GIT_", "MACOSX_", "VS", "VC", "WINDOWSSDK", "UNIVERSALCRT",
+    "BINDGEN_", "LIBCLANG", "CLANG_", "LLVM_", "PROTOC", "CMAKE", "CFLAGS_", "LDFLAGS_",
+    "TARGET_", "HOST_",
+)
+
+def _cargo_base_env() -> Dict[str, str]:
+    if os.environ.get("BUCKYOS_MINIMAL_CARGO_ENV", "0") in ("", "0"):
+        return os.environ.copy()
+    return {
+        key: value
+        for key, value in os.environ.items()
+        if key.upper() in _CARGO_ENV_ALLOWLIST or key.upper().startswith(_CARGO_ENV_PREFIXES)
+    }
+
+def _apply_sccache_env(env: Dict[str, str]) -> None:
+    # Installed sccache is used unless BUCKYOS_USE_SCCACHE=0 or another RUSTC_WRAPPER is set
+    if env.get("BUCKYOS_USE_SCCACHE", "1") == "0" or not _tool_exists("sccache"):
+        return
+    env.setdefault("RUSTC_WRAPPER", "sccache")
+    if os.path.basename(env["RUSTC_WRAPPER"]) not in ("sccache", "sccache.exe"):
+        return
+    # sccache can't cache incremental builds
+    env["CARGO_INCREMENTAL"] = "0"
+    if env.get("SCCACHE_BUCKET"):
+        backend = f"bucket {env['SCCACHE_BUCKET']}"
+    else:
+        backend = env.get("SCCACHE_DIR") or "default local cache"
+    print(f"sccache enabled, cache: {backend}")
+
 def build_rust_modules(
     project: BuckyProject,
     rust_target: str,
@@ -450,26 +617,50 @@ def build_rust_modules(
     timings: bool = False,
     timings_dir: str | Path | None = None,
 ):
+    """Build the project's Rust crates with `cargo build --release`
+
+    Incremental compilation is turned off (CARGO_INCREMENTAL=0) unless the caller sets
+    CARGO_INCREMENTAL or BUCKYOS_KEEP_INCREMENTAL=1: it slows from-scratch release builds
+    and bloats target/, but local rebuilds after small edits benefit from keeping it.
+
+    cargo inherits the caller's environment; BUCKYOS_MINIMAL_CARGO_ENV=1 trims it to
+    the toolchain-related variables in _CARGO_ENV_ALLOWLIST / _CARGO_ENV_PREFIXES.
+    """
     print(f"🚀 Building Rust code,target_dir is {project.rust_target_dir},target is {rust_target}")
-    env = os.environ.copy()
-    build_env = get_build_metadata(str(project.base_dir))
-    for key, value in build_env.items():
-        env.setdefault(key, value)
-    env['VERSION'] = project.version
+    build_env = get_build_metadata(str(project.base_dir), _needs_git_dirty(project))
+    cross_compile_env_vars = get_cross_compile_env_vars_by_target(rust_target)
+    target_env_vars = get_env_vars_by_target(rust_target)
+    # Later layers win: build metadata only fills in what the caller's environment lacks,
+    # project and target settings override both.
+    env = {
+        **build_env,
+        **_cargo_base_env(),
+        "VERSION": project.version,
+        "VERSION_EXTEND": make_version_extend(build_env),
+        **project.rust_env,
+        **target_env_vars,
+        **(cross_compile_env_vars or {}),
+    }
+    # Target flags extend the caller's RUSTFLAGS instead of replacing them
+    rustflags = canonical_rustflags(
+        project.rust_env.get("RUSTFLAGS", os.environ.get("RUSTFLAGS", "")),
+        target_env_vars.get("RUSTFLAGS", ""),
+    )
+    if rustflags:
+        env["RUSTFLAGS"] = rustflags
+    if env.get("BUCKYOS_KEEP_INCREMENTAL", "0") in ("", "0"):
+        env.setdefault("CARGO_INCREMENTAL", "0")
+    _apply_sccache_env(env)
     print(f"set VERSION={env['VERSION']}")
-    env["VERSION_EXTEND"] = make_version_extend(build_env)
     print(f"set VERSION_EXTEND={env['VERSION_EXTEND']}")
-    env.update(project.rust_env)
 
-    env_vars = get_env_vars_by_target(rust_target)
-    env.update(env_vars)
-    
     target_dir = _resolve_rust_target_dir(project)
     timings = timings or timings_dir is not None
     previous_timing_reports = _get_timing_reports(target_dir) if timings_dir is not None else []
 
-    cross_compile_env_vars = get_cross_compile_env_vars_by_target(rust_target)
     cargo_args = ["cargo", "build", "--release", "--target-dir", str(target_dir)]
+    if cross_compile_env_vars:
+        cargo_args[3:3] = ["--target", rust_target]
     if timings:
         cargo_args.append("--timings")
     if selected_modules is not None:
@@ -485,12 +676,14 @@ def build_rust_modules(
             print("No Rust modules selected; skipping Rust build.")
             return
 
+        # Keep all selected crates in one cargo invocation: cargo already schedules
+        # independent crates in parallel, while separate concurrent `cargo build -p`
+        # processes would just queue on the shared target-dir lock.
         for module_name in rust_modules:
             cargo_args.extend(["-p", project.modules[module_name].name])
 
     if cross_compile_env_vars:
         print("⚠️ cross compile enabled for target: ", rust_target)
-        env.update(cross_compile_env_vars)
         cross_compile_context = _get_cross_compile_context(rust_target)
         if (
             cross_compile_context is not None
@@ -498,20 +691,9 @@ def build_rust_modules(
             and cross_compile_context["target_os"] == "linux"
         ):
             _apply_darwin_linux_cross_compile_env(env, rust_target)
-        cargo_args_with_target = cargo_args[:]
-        cargo_args_with_target.insert(3, rust_target)
-        cargo_args_with_target.insert(3, "--target")
-        print("*", " ".join(cargo_args_with_target))
-        subprocess.run(cargo_args_with_target,
-                    check=True, 
-                    cwd=project.base_dir, 
-                    env=env)
-    else:
-        print("*", " ".join(cargo_args))
-        subprocess.run(cargo_args,
-                    check=True,
-                    cwd=project.base_dir,
-                    env=env)
+
+    print("*", " ".join(cargo_args))
+    subprocess.run(cargo_args, check=True, cwd=project.base_dir, env=env)
 
     if timings_dir is not None:
         _copy_timing_reports(project, target_dir, timings_dir, previous_timing_reports)
@@ -1,47 +1,22 @@
+import asyncio
 import os
+import shutil
 import subprocess
-import json
-from typing import List
+from pathlib import Path
+from typing import Dict, List, Tuple
 from .project import BuckyProject, WebModuleInfo
+from .web_deps import get_github_dependencies
 
 src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
 
 
-def get_github_dependencies(package_json_path: str) -> List[str]:
-    """Extract GitHub dependencies from package.json
-    
-    Recognizes the following formats:
-    - "github:owner/repo"
-    - "git+https://github.com/..."
-    - "git+ssh://git@github.com/..."
-    """
-    if not os.path.exists(package_json_path):
-        return []
-    
-    try:
-        with open(package_json_path, 'r', encoding='utf-8') as f:
-            pkg = json.load(f)
-        
-        github_deps = []
-        dependencies = pkg.get('dependencies', {})
-        
-        for name, version in dependencies.items():
-            if isinstance(version, str):
-                # Check if it's a GitHub dependency
-                if any(pattern in version.lower() for pattern in ['github:', 'git+https://github.com', 'git+ssh://git@github.com']):
-                    github_deps.append(name)
-        
-        return github_deps
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"Warning: unable to read package.json: {e}")
-        return []
+def _pnpm_command() -> str:
+    # Resolve pnpm.cmd on Windows, where processes are started without a shell
+    return shutil.which("pnpm") or "pnpm"
 
 
-def build_web_module(project: BuckyProject, module_name: str):
-    """Build a web module
-    
-    Automatically detects and updates GitHub dependencies while keeping other dependencies stable.
-    """
+def _web_module_commands(project: BuckyProject, module_name: str) -> Tuple[Path, List[List[str]]]:
+    """Return the working directory and pnpm command sequence for a web module"""
     module_info = project.modules[module_name]
     if not module_info:
         raise ValueError(f"Web module {module_name} not found")
@@ -54,37 +29,118 @@ def build_web_module(project: BuckyProject, module_name: str):
     github_deps = get_github_dependencies(package_json)
     
     # Build command
-    cmd = 'pnpm install'
+    pnpm = _pnpm_command()
+    install_cmd = [pnpm, 'install', '--prefer-offline']
+    if github_deps:
+        # The update below rewrites the lockfile anyway; keep the frozen default otherwise
+        install_cmd.append('--no-frozen-lockfile')
+    cmds = [install_cmd]
     
     if github_deps:
-        deps_str = ' '.join(github_deps)
-        cmd += f' && pnpm update {deps_str}'
+        cmds.append([pnpm, 'update', *github_deps])
         print(f'  -> Will update GitHub dependencies: {", ".join(github_deps)}')
     
-    cmd += ' && pnpm run build'
+    cmds.append([pnpm, 'run', 'build'])
     
-    print(f'* Build web module {module_name}:\n**\t{cmd} ')
-    subprocess.run(cmd, shell=True, cwd=work_dir, check=True)
+    print(f'* Build web module {module_name}:\n**\t{" && ".join(" ".join(cmd) for cmd in cmds)} ')
+    return work_dir, cmds
+
+
+def _pnpm_workspace_root(work_dir: Path) -> Path:
+    """Return the pnpm workspace work_dir belongs to, or work_dir itself if it has none"""
+    work_dir = Path(work_dir)
+    if (work_dir / 'pnpm-workspace.yaml').exists():
+        return work_dir
+    for parent in work_dir.parents:
+        if (parent / 'pnpm-workspace.yaml').exists() or (parent / 'pnpm-lock.yaml').exists():
+            return parent
+    return work_dir
+
+
+def build_web_module(project: BuckyProject, module_name: str):
+    """Build a web module
+    
+    Automatically detects and updates GitHub dependencies while keeping other dependencies stable.
+    """
+    work_dir, cmds = _web_module_commands(project, module_name)
+    for cmd in cmds:
+        subprocess.run(cmd, cwd=work_dir, check=True)
     print(f'Build web module {module_name} completed')
 
-def build_web_modules(project: BuckyProject, selected_modules: List[str] | None = None):
-    """Build web modules in the project"""
+
+async def _run_web_module_commands(module_name: str, work_dir: Path, cmds: List[List[str]]):
+    for cmd in cmds:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=work_dir,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        output, _ = await proc.communicate()
+        # Print each step's output in one piece so concurrent modules do not interleave
+        text = output.decode(errors='replace')
+        if text:
+            print(f'[{module_name}] {" ".join(cmd)}\n{text}', end='' if text.endswith('\n') else '\n')
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, output=output)
+    print(f'Build web module {module_name} completed')
+
+
+async def _run_web_module_group(jobs: List[Tuple[str, Path, List[List[str]]]], sem: asyncio.Semaphore):
+    # Modules of one workspace share node_modules and the lockfile, so they build one after another
+    first_error = None
+    async with sem:
+        for module_name, work_dir, cmds in jobs:
+            try:
+                await _run_web_module_commands(module_name, work_dir, cmds)
+            except Exception as e:
+                first_error = first_error or e
+    if first_error is not None:
+        raise first_error
+
+
+async def _build_web_modules_concurrently(groups: List[List[Tuple[str, Path, List[List[str]]]]], max_parallel: int):
+    sem = asyncio.Semaphore(max_parallel)
+    results = await asyncio.gather(
+        *(_run_web_module_group(jobs, sem) for jobs in groups),
+        return_exceptions=True,
+    )
+    # Let every module finish before reporting the first failure
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+def build_web_modules(
+    project: BuckyProject,
+    selected_modules: List[str] | None = None,
+    max_parallel: int | None = None,
+):
+    """Build web modules in the project
+    
+    Modules are grouped by pnpm workspace: groups build concurrently, at most
+    max_parallel (default: CPU count) at a time, and the modules inside a group
+    build one after another so they never race on a shared node_modules or lockfile.
+    """
     # 如果project里没有 web_modules 直接跳过这个函数
+    selected_set = None if selected_modules is None else set(selected_modules)
     web_modules = [
         module_name
         for module_name, module_info in project.modules.items()
-        if project.modules[module_name].type == "web"
+        if module_info.type == "web" and (selected_set is None or module_name in selected_set)
     ]
-    if selected_modules is not None:
-        selected_set = set(selected_modules)
-        web_modules = [module_name for module_name in web_modules if module_name in selected_set]
     if not web_modules:
         return
 
     print(f'🚀 Building web modules ...')
-    for module_name in web_modules:
-        build_web_module(project, module_name)
+    if len(web_modules) == 1:
+        build_web_module(project, web_modules[0])
+    else:
+        groups: Dict[Path, List[Tuple[str, Path, List[List[str]]]]] = {}
+        for module_name in web_modules:
+            work_dir, cmds = _web_module_commands(project, module_name)
+            groups.setdefault(_pnpm_workspace_root(work_dir), []).append((module_name, work_dir, cmds))
+        limit = min(len(groups), max(1, max_parallel or os.cpu_count() or 1))
+        asyncio.run(_build_web_modules_concurrently(list(groups.values()), limit))
     
     print(f'✅ Build web modules completed')
-
-
@@ -23,15 +23,32 @@
 
 import argparse
 import json
+import os
 import shutil
 import subprocess
 import sys
 from pathlib import Path
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, Iterable, List, Optional, Tuple
 from .util import get_buckyos_root
 from .cert_mgr import CertManager  # type: ignore
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# meta_index.db.fileobj payload: a fresh create_time marks the repo cache as just updated,
+# so node_daemon does not trigger an auto-update. Same text json.dumps(..., indent=2) produced.
+_META_INDEX_CACHE_TEMPLATE = """{{
+  "name": "test.data",
+  "size": 100,
+  "content": "sha256:1234567890",
+  "create_time": {create_time}
+}}"""
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 ROOTFS_DIR = SCRIPT_DIR.parent / "rootfs"
 BUCKYCLI_BIN = ROOTFS_DIR / "bin" / "buckycli" / "buckycli"
@@ -40,7 +57,16 @@ if not BUCKYCLI_BIN.exists():
     if not BUCKYCLI_BIN.exists():
         raise FileNotFoundError(f"buckycli binary missing at {BUCKYCLI_BIN}")
 
-print(f"* buckycli at {BUCKYCLI_BIN}")
+# Existence is checked above, once per import
+BUCKYCLI_BIN_STR = str(BUCKYCLI_BIN)
+print(f"* buckycli at {BUCKYCLI_BIN_STR}")
+
+
+_META_INDEX_REL = Path("local/node_daemon/root_pkg_env/pkgs/meta_index.db.fileobj")
+
+
+def _meta_index_path(target_dir: Path) -> Path:
+    return target_dir / _META_INDEX_REL
 
 
 def ensure_dir(path: Path) -> Path:
@@ -48,38 +74,80 @@ def ensure_dir(path: Path) -> Path:
     return path
 
 
+@lru_cache(maxsize=256)
+def _ensure_dir_cached(path_str: str) -> None:
+    Path(path_str).mkdir(parents=True, exist_ok=True)
+
+
+def ensure_output_dir(path: Path) -> Path:
+    """ensure_dir for output dirs that are never removed during a run; repeat calls skip the mkdir."""
+    _ensure_dir_cached(str(path))
+    return path
+
+
 def run_cmd(cmd: List[str], cwd: Optional[Path] = None) -> None:
-    result = subprocess.run(
-        cmd,
-        cwd=str(cwd) if cwd is not None else None,
-        text=True,
-        capture_output=True,
-    )
-    if result.stdout:
-        print(result.stdout)
-    if result.stderr:
-        print(result.stderr, file=sys.stderr)
+    # The child writes straight to our stdout/stderr so progress shows up live
+    result = subprocess.run(cmd, cwd=str(cwd) if cwd is not None else None)
     if result.returncode != 0:
         raise RuntimeError(f"command failed: {' '.join(cmd)}")
 
 
 def run_buckycli(args: List[str]) -> None:
-    cmd = [str(BUCKYCLI_BIN)] + args
+    cmd = [BUCKYCLI_BIN_STR] + args
     run_cmd(cmd, cwd=ROOTFS_DIR)
 
 
-def copy_if_exists(src: Path, dst: Path) -> None:
-    if not src.exists():
-        print(f"skip missing file: {src}")
+def _fast_copy(src: Path, dst: Path, src_stat: Optional[os.stat_result] = None) -> None:
+    # Only for _buckycli_tmp outputs, which are deleted afterwards: they live in the same
+    # target_dir, so a hardlink usually works; fall back to a real copy
+    if src_stat is None:
+        src_stat = os.stat(src)
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        dst_stat = None
+    if dst_stat is not None and os.path.samestat(src_stat, dst_stat):
+        return
+    try:
+        if dst_stat is not None:
+            os.unlink(dst)
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    # A real copy, so edits to the deployed file never reach src (e.g. a user-supplied CA key).
+    # Drop dst first in case an older run left a hardlink to src there.
+    if os.path.abspath(src) == os.path.abspath(dst):
         return
-    ensure_dir(dst.parent)
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
     shutil.copy2(src, dst)
+
+
+def copy_if_exists(src: Path, dst: Path, link: bool = False) -> None:
+    try:
+        src_stat = os.stat(src)
+    except FileNotFoundError:
+        print(f"skip missing file: {src}")
+        return
+    ensure_output_dir(dst.parent)
+    if link:
+        _fast_copy(src, dst, src_stat)
+    else:
+        _copy_file(src, dst)
     print(f"copy {src} -> {dst}")
 
 
 def write_json(path: Path, data: dict) -> None:
-    ensure_dir(path.parent)
-    path.write_text(json.dumps(data, indent=2))
+    ensure_output_dir(path.parent)
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2))
     print(f"write json {path}")
 
 
@@ -89,8 +157,8 @@ def make_global_env_config(
     trust_did: Iterable[str],
     force_https: bool,
 ) -> None:
-    """Write machine-level config and default meta_index cache."""
-    etc_dir = ensure_dir(target_dir / "etc")
+    """Write machine-level config."""
+    etc_dir = ensure_output_dir(target_dir / "etc")
 
     machine = {
         "web3_bridge": {"bns": web3_bns},
@@ -99,22 +167,6 @@ def make_global_env_config(
     }
     write_json(etc_dir / "machine.json", machine)
 
-    meta_dst = (
-        target_dir
-        / "local"
-        / "node_daemon"
-        / "root_pkg_env"
-        / "pkgs"
-        / "meta_index.db.fileobj"
-    )
-
-    ensure_dir(meta_dst.parent)
-    now_unix_time = int(time.time())
-    meta_dst.write_text(
-        json.dumps({"name":"test.data","size":100,"content":"sha256:1234567890","create_time":now_unix_time}, indent=2)
-    )
-    print(f"create default meta_index cache at {meta_dst}")
-
 
 def make_cache_did_docs(target_dir: Path) -> None:
     """Construct did_docs via buckycli (depends on future build_did_docs implementation)."""
@@ -130,16 +182,44 @@ def make_cache_did_docs(target_dir: Path) -> None:
 def _copy_identity_outputs(
     user_dir: Path, node_dir: Path, target_dir: Path, zone_id: str
 ) -> None:
-    etc_dir = ensure_dir(target_dir / "etc")
+    etc_dir = ensure_output_dir(target_dir / "etc")
 
-    copy_if_exists(user_dir / f"{zone_id}.zone.json", etc_dir / f"{zone_id}.zone.json")
+    copy_if_exists(user_dir / f"{zone_id}.zone.json", etc_dir / f"{zone_id}.zone.json", link=True)
     for name in ("start_config.json", "node_identity.json", "node_private_key.pem"):
-        copy_if_exists(node_dir / name, etc_dir / name)
+        copy_if_exists(node_dir / name, etc_dir / name, link=True)
 
-    buckycli_dir = ensure_dir(etc_dir / ".buckycli")
+    buckycli_dir = ensure_output_dir(etc_dir / ".buckycli")
     for name in ("user_config.json", "user_private_key.pem"):
-        copy_if_exists(user_dir / name, buckycli_dir / name)
-    copy_if_exists(user_dir / f"{zone_id}.zone.json", buckycli_dir / "zone_config.json")
+        copy_if_exists(user_dir / name, buckycli_dir / name, link=True)
+    copy_if_exists(user_dir / f"{zone_id}.zone.json", buckycli_dir / "zone_config.json", link=True)
+
+
+@lru_cache(maxsize=1)
+def _get_cert_mgr() -> CertManager:
+    # CertManager() probes the openssl binary; one instance serves every cert in the process
+    return CertManager()
+
+
+def _san_list(*hostnames: str) -> List[str]:
+    # Order matters: cert_mgr uses the first name as CN and output file name
+    return list(dict.fromkeys(hostnames))
+
+
+def _find_ca_pair(ca_dir_path: Path) -> Tuple[Path, Path]:
+    """Return the first *_ca_cert.pem in ca_dir_path and its matching *_ca_key.pem, from one directory scan."""
+    cert_name = None
+    names = set()
+    with os.scandir(ca_dir_path) as entries:
+        for entry in entries:
+            names.add(entry.name)
+            if cert_name is None and entry.name.endswith("_ca_cert.pem"):
+                cert_name = entry.name
+    if cert_name is None:
+        raise FileNotFoundError(f"no *_ca_cert.pem in {ca_dir_path}")
+    key_name = cert_name[: -len("_ca_cert.pem")] + "_ca_key.pem"
+    if key_name not in names:
+        raise FileNotFoundError(f"CA key not found: {ca_dir_path / key_name}")
+    return ca_dir_path / cert_name, ca_dir_path / key_name
 
 
 def _generate_tls(zone_id: str, ca_name: str, etc_dir: Path, ca_dir: Optional[Path]) -> None:
@@ -147,19 +227,13 @@ def _generate_tls(zone_id: str, ca_name: str, etc_dir: Path, ca_dir: Optional[Pa
         print("warning: cert_mgr not available, skip TLS cert generation")
         return
 
-    cm = CertManager()
+    cm = _get_cert_mgr()
     # Prefer user-provided CA directory
     if ca_dir:
-        ca_dir_path = ca_dir.resolve()
+        ca_dir_path = ca_dir.absolute()
         if not ca_dir_path.exists():
             raise FileNotFoundError(f"CA dir not found: {ca_dir_path}")
-        ca_cert_candidates = list(ca_dir_path.glob("*_ca_cert.pem"))
-        if not ca_cert_candidates:
-            raise FileNotFoundError(f"no *_ca_cert.pem in {ca_dir_path}")
-        ca_cert_path = ca_cert_candidates[0]
-        ca_key_path = ca_dir_path / ca_cert_path.name.replace("_ca_cert.pem", "_ca_key.pem")
-        if not ca_key_path.exists():
-            raise FileNotFoundError(f"CA key not found: {ca_key_path}")
+        ca_cert_path, ca_key_path = _find_ca_pair(ca_dir_path)
     else:
         cert_dir = ensure_dir(etc_dir / "certs")
         ca_cert, ca_key = cm.create_ca(str(cert_dir), name=ca_name)
@@ -168,7 +242,7 @@ def _generate_tls(zone_id: str, ca_name: str, etc_dir: Path, ca_dir: Optional[Pa
     cert_path, key_path = cm.create_cert_from_ca(
         str(ca_dir_path if ca_dir else ca_cert_path.parent),
         hostname=zone_id,
-        hostnames=[zone_id, f"*.{zone_id}"],
+        hostnames=_san_list(zone_id, f"*.{zone_id}"),
         target_dir=str(etc_dir),
     )
 
@@ -189,67 +263,62 @@ def make_identity_files(
     sn_base_host: str,
     ca_name: str,
     ca_dir: Optional[Path],
+    keep_tmp: bool = False,
 ) -> None:
-    """Use buckycli to generate identity files and use cert_mgr to generate TLS certificates."""
-    if not BUCKYCLI_BIN.exists():
-        raise FileNotFoundError(f"buckycli binary missing at {BUCKYCLI_BIN}")
+    """Use buckycli to generate identity files and use cert_mgr to generate TLS certificates.
 
+    buckycli's working output under _buckycli_tmp is removed afterwards unless keep_tmp is set.
+    """
     tmp_root = ensure_dir(target_dir / "_buckycli_tmp")
     user_tmp = ensure_dir(tmp_root / zone_id)
 
-    # 1. Create user/zone
-    run_buckycli(
-        [
-            "create_user_env",
-            "--username",
-            username,
-            "--hostname",
-            zone_id,
-            "--ood_name",
-            node_name,
-            "--sn_base_host",
-            sn_base_host,
-            "--output_dir",
-            str(user_tmp),
-        ]
-    )
+    try:
+        # 1. Create user/zone
+        run_buckycli(
+            [
+                "create_user_env",
+                "--username",
+                username,
+                "--hostname",
+                zone_id,
+                "--ood_name",
+                node_name,
+                "--sn_base_host",
+                sn_base_host,
+                "--output_dir",
+                str(user_tmp),
+            ]
+        )
 
-    # 2. Create node config
-    run_buckycli(
-        [
-            "create_node_configs",
-            "--device_name",
-            node_name,
-            "--env_dir",
-            str(user_tmp),
-        ]
-    )
+        # 2. Create node config
+        run_buckycli(
+            [
+                "create_node_configs",
+                "--device_name",
+                node_name,
+                "--env_dir",
+                str(user_tmp),
+            ]
+        )
 
-    # 3. Copy identity files
-    user_dir = user_tmp
-    node_dir = user_dir / node_name
-    _copy_identity_outputs(user_dir, node_dir, target_dir, zone_id)
+        # 3. Copy identity files
+        user_dir = user_tmp
+        node_dir = user_dir / node_name
+        _copy_identity_outputs(user_dir, node_dir, target_dir, zone_id)
+    finally:
+        if not keep_tmp:
+            shutil.rmtree(tmp_root, ignore_errors=True)
 
     # 4. TLS certificates
-    _generate_tls(zone_id, ca_name, ensure_dir(target_dir / "etc"), ca_dir)
+    _generate_tls(zone_id, ca_name, ensure_output_dir(target_dir / "etc"), ca_dir)
 
 
 def make_repo_cache_file(target_dir: Path) -> None:
     """Write meta_index cache file (placeholder to prevent auto-update)."""
-    meta_dst = (
-        target_dir
-        / "local"
-        / "node_daemon"
-        / "root_pkg_env"
-        / "pkgs"
-        / "meta_index.db.fileobj"
-    )
-    if not meta_dst.exists():
-        ensure_dir(meta_dst.parent)
-        meta_dst.write_text(
-            '{"content":"sha256:e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855","name":"meta_index.db","size":53248}'
-        )
-        print(f"create default meta_index cache at {meta_dst}")
+    meta_dst = _meta_index_path(target_dir)
+    ensure_dir(meta_dst.parent)
+    meta_dst.write_text(_META_INDEX_CACHE_TEMPLATE.format(create_time=int(time.time())))
+    print(f"create default meta_index cache at {meta_dst}")
 
 
 def make_sn_configs(
@@ -280,13 +349,12 @@ def make_sn_configs(
         ca_name: CA certificate name
         ca_dir: Use existing CA directory, otherwise auto-generate
     """
-    if not BUCKYCLI_BIN.exists():
-        raise FileNotFoundError(f"buckycli binary missing at {BUCKYCLI_BIN}")
-    
-    print(f"Generate SN config files to {target_dir} ...")
-    print(f"  SN base domain: {sn_base_host}")
-    print(f"  SN IP address: {sn_ip}")
-    print(f"  SN device name: {sn_device_name}")
+    print(
+        f"Generate SN config files to {target_dir} ...\n"
+        f"  SN base domain: {sn_base_host}\n"
+        f"  SN IP address: {sn_ip}\n"
+        f"  SN device name: {sn_device_name}"
+    )
     
     # SN config files placed flatly under target_dir, no etc subdirectory created
     ensure_dir(target_dir)
@@ -313,29 +381,25 @@ def make_sn_configs(
         for file in buckycli_sn_dir.glob("*"):
             if file.is_file():
                 dest_file = target_dir / file.name
-                shutil.move(str(file), str(dest_file))
+                os.replace(file, dest_file)
                 print(f"Move file: {file.name} -> {target_dir}/")
-        # Delete empty sn_server directory
-        if buckycli_sn_dir.exists() and not list(buckycli_sn_dir.iterdir()):
+        # Delete sn_server directory if it is now empty
+        try:
             buckycli_sn_dir.rmdir()
+        except OSError:
+            pass
 
     
     # 2. Generate TLS certificates
     print("# Step 2: Generate TLS certificates...")
 
-    cm = CertManager()
+    cm = _get_cert_mgr()
     
     # Generate or use existing CA
     if ca_dir and ca_dir.exists():
-        ca_dir_path = ca_dir.resolve()
+        ca_dir_path = ca_dir.absolute()
         print(f"Use existing CA: {ca_dir_path}")
-        ca_cert_candidates = list(ca_dir_path.glob("*_ca_cert.pem"))
-        if not ca_cert_candidates:
-            raise FileNotFoundError(f"*_ca_cert.pem not found in {ca_dir_path}")
-        ca_cert_path = ca_cert_candidates[0]
-        ca_key_path = ca_dir_path / ca_cert_path.name.replace("_ca_cert.pem", "_ca_key.pem")
-        if not ca_key_path.exists():
-            raise FileNotFoundError(f"CA private key not found: {ca_key_path}")
+        ca_cert_path, ca_key_path = _find_ca_pair(ca_dir_path)
     else:
         # Generate new CA
         ca_output_dir = ensure_dir(target_dir / "ca")
@@ -351,26 +415,31 @@ def make_sn_configs(
         str(ca_cert_path.parent),
         hostname=sn_hostname,
         target_dir=str(target_dir),
-        hostnames=[web3_wildcard, f"web3.{sn_base_host}"],
+        hostnames=_san_list(sn_hostname, web3_wildcard, f"web3.{sn_base_host}"),
     )
     
     # Copy/rename to standard filenames
     cert_file = Path(cert_path)
     key_file = Path(key_path)
     
-    shutil.move(cert_file, target_dir / "fullchain.cert")
-    shutil.move(key_file, target_dir / "fullchain.pem")
+    # create_cert_from_ca wrote them into target_dir, so a rename is enough
+    fullchain_cert = target_dir / "fullchain.cert"
+    fullchain_key = target_dir / "fullchain.pem"
+    os.replace(cert_file, fullchain_cert)
+    os.replace(key_file, fullchain_key)
     
-    # Copy CA certificate to ca directory (for client trust)
-    if ca_dir:
-        ca_output_dir = ensure_dir(target_dir / "ca")
-        shutil.copy2(ca_cert_path, ca_output_dir / ca_cert_path.name)
-        shutil.copy2(ca_key_path, ca_output_dir / ca_key_path.name)
+    # Copy CA certificate to ca directory (for client trust), unless it already lives there
+    ca_output_dir = ensure_dir(target_dir / "ca")
+    if not os.path.samefile(ca_cert_path.parent, ca_output_dir):
+        _copy_file(ca_cert_path, ca_output_dir / ca_cert_path.name)
+        _copy_file(ca_key_path, ca_output_dir / ca_key_path.name)
     
-    print(f"TLS certificates generated:")
-    print(f"  - {target_dir / 'fullchain.cert'}")
-    print(f"  - {target_dir / 'fullchain.pem'}")
-    print(f"  - {target_dir / 'ca' / ca_cert_path.name}")
+    print(
+        f"TLS certificates generated:\n"
+        f"  - {fullchain_cert}\n"
+        f"  - {fullchain_key}\n"
+        f"  - {ca_output_dir / ca_cert_path.name}"
+    )
     
     #3 Modify params.json
     params_json = {
@@ -383,20 +452,29 @@ def make_sn_configs(
         }
     }
     
-    print(f"\n✓ SN config files generation completed!")
-    print(f"  Output directory: {target_dir}")
-    print(f"\nGenerated files:")
-    print(f"  - {target_dir / 'sn_device_config.json'} (SN server device config)")
-    print(f"  - {target_dir / 'sn_private_key.pem'} (device private key)")
-    print(f"  - {target_dir / 'fullchain.cert'} (server certificate)")
-    print(f"  - {target_dir / 'fullchain.pem'} (server private key)")
-    print(f"  - {target_dir / 'ca' / 'buckyos_sn_ca_cert.pem'} (CA certificate)")
-    print(f"  - {target_dir / 'params.json'} (SN config parameters)")
-    print(f"\nFiles that need manual creation:")
-    print(f"  - {target_dir / 'dns_zone'} (DNS Zone config)")
-    print(f"  - {target_dir / 'website.yaml'} (website config)")
-    print(f"\nOther notes:")
-    print(f"  - Test environment requires installing CA certificate to client trust list")
+    # Emit the summary as one write
+    report = [
+        "",
+        "✓ SN config files generation completed!",
+        f"  Output directory: {target_dir}",
+        "",
+        "Generated files:",
+        f"  - {target_dir / 'sn_device_config.json'} (SN server device config)",
+        f"  - {target_dir / 'sn_private_key.pem'} (device private key)",
+        f"  - {fullchain_cert} (server certificate)",
+        f"  - {fullchain_key} (server private key)",
+        f"  - {ca_output_dir / 'buckyos_sn_ca_cert.pem'} (CA certificate)",
+        f"  - {target_dir / 'params.json'} (SN config parameters)",
+        "",
+        "Files that need manual creation:",
+        f"  - {target_dir / 'dns_zone'} (DNS Zone config)",
+        f"  - {target_dir / 'website.yaml'} (website config)",
+        "",
+        "Other notes:",
+        "  - Test environment requires installing CA certificate to client trust list",
+    ]
+    sys.stdout.write("\n".join(report) + "\n")
+    sys.stdout.flush()
 
 
 def make_sn_db(target_dir: Path, user_list: List[str]) -> None:
@@ -404,75 +482,68 @@ def make_sn_db(target_dir: Path, user_list: List[str]) -> None:
     print("skip sn_db generation (not implemented)")
 
 
+_TRUST_DID = (
+    "did:web:buckyos.org",
+    "did:web:buckyos.ai",
+    "did:web:buckyos.io",
+)
+
+_GROUP_PARAMS: Dict[str, Dict[str, object]] = {
+    "dev": {
+        "username": "devtest",
+        "zone_id": "test.buckyos.io",
+        "node_name": "ood1",
+        "netid": "",
+        "sn_base_host": "",
+        "web3_bridge": "web3.devtests.org",
+        "trust_did": _TRUST_DID,
+        "force_https": False,
+        "ca_name": "buckyos_local",
+        "is_sn": False,
+    },
+    "alice.ood1": {
+        "username": "alice",
+        "zone_id": "alice.web3.devtests.org",
+        "node_name": "ood1",
+        "netid": "",
+        "sn_base_host": "devtests.org",
+        "web3_bridge": "web3.devtests.org",
+        "trust_did": _TRUST_DID,
+        "force_https": False,
+        "ca_name": "buckyos_local",
+        "is_sn": False,
+    },
+    "bob.ood1": {
+        "username": "bob",
+        "zone_id": "bob.web3.devtests.org",
+        "node_name": "ood1",
+        "netid": "",
+        "sn_base_host": "devtests.org",
+        "web3_bridge": "web3.devtests.org",
+        "trust_did": _TRUST_DID,
+        "force_https": False,
+        "ca_name": "buckyos_local",
+        "is_sn": False,
+    },
+    "sn_server": {
+        "sn_base_host": "devtests.org",
+        "sn_ip": "127.0.0.1",
+        "sn_device_name": "sn_server",
+        "web3_bridge": "web3.devtests.org",
+        "trust_did": _TRUST_DID,
+        "force_https": False,
+        "ca_name": "buckyos_sn",
+        "is_sn": True,
+    },
+}
+
+
 def get_params_from_group_name(group_name: str) -> Dict[str, object]:
-    """Get all generation parameters based on group name."""
-    if group_name == "dev":
-        return {
-            "username": "devtest",
-            "zone_id": "test.buckyos.io",
-            "node_name": "ood1",
-            "netid": "",
-            "sn_base_host": "",
-            "web3_bridge": "web3.devtests.org",
-            "trust_did": [
-                "did:web:buckyos.org",
-                "did:web:buckyos.ai",
-                "did:web:buckyos.io",
-            ],
-            "force_https": False,
-            "ca_name": "buckyos_local",
-            "is_sn": False,
-        }
-    if group_name == "alice.ood1":
-        return {
-            "username": "alice",
-            "zone_id": "alice.web3.devtests.org",
-            "node_name": "ood1",
-            "netid": "",
-            "sn_base_host": "devtests.org",
-            "web3_bridge": "web3.devtests.org",
-            "trust_did": [
-                "did:web:buckyos.org",
-                "did:web:buckyos.ai",
-                "did:web:buckyos.io",
-            ],
-            "force_https": False,
-            "ca_name": "buckyos_local",
-            "is_sn": False,
-        }
-    if group_name == "bob.ood1":
-        return {
-            "username": "bob",
-            "zone_id": "bob.web3.devtests.org",
-            "node_name": "ood1",
-            "netid": "",
-            "sn_base_host": "devtests.org",
-            "web3_bridge": "web3.devtests.org",
-            "trust_did": [
-                "did:web:buckyos.org",
-                "did:web:buckyos.ai",
-                "did:web:buckyos.io",
-            ],
-            "force_https": False,
-            "ca_name": "buckyos_local",
-            "is_sn": False,
-        }
-    if group_name == "sn_server":
-        return {
-            "sn_base_host": "devtests.org",
-            "sn_ip": "127.0.0.1",
-            "sn_device_name": "sn_server",
-            "web3_bridge": "web3.devtests.org",
-            "trust_did": [
-                "did:web:buckyos.org",
-                "did:web:buckyos.ai",
-                "did:web:buckyos.io",
-            ],
-            "force_https": False,
-            "ca_name": "buckyos_sn",
-            "is_sn": True,
-        }
-    raise ValueError(f"invalid group name: {group_name}")
+    """Get all generation parameters based on group name (shared, callers must not modify)."""
+    try:
+        return _GROUP_PARAMS[group_name]
+    except KeyError:
+        raise ValueError(f"invalid group name: {group_name}") from None
 
 def make_config_by_group_name(group_name: str, target_root: Optional[Path], ca_dir: Optional[Path]) -> None:
     params = get_params_from_group_name(group_name)
@@ -509,24 +580,31 @@ def make_config_by_group_name(group_name: str, target_root: Optional[Path], ca_d
         print(f"node       : {params['node_name']}")
         print(f"web3_bridge: {params['web3_bridge']}")
         
-        make_global_env_config(
-            target_root,
-            params["web3_bridge"],
-            params["trust_did"],
-            params["force_https"],
-        )
-        
-        make_cache_did_docs(target_root)
-        make_identity_files(
-            target_root,
-            params["username"],
-            params["zone_id"],
-            params["node_name"],
-            params["sn_base_host"],
-            params["ca_name"],
-            ca_dir,
-        )
-        make_repo_cache_file(target_root)
+        # The steps write disjoint parts of rootfs and mostly wait on buckycli / cert_mgr
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(
+                    make_global_env_config,
+                    target_root,
+                    params["web3_bridge"],
+                    params["trust_did"],
+                    params["force_https"],
+                ),
+                executor.submit(make_repo_cache_file, target_root),
+                executor.submit(make_cache_did_docs, target_root),
+                executor.submit(
+                    make_identity_files,
+                    target_root,
+                    params["username"],
+                    params["zone_id"],
+                    params["node_name"],
+                    params["sn_base_host"],
+                    params["ca_name"],
+                    ca_dir,
+                ),
+            ]
+            for future in futures:
+                future.result()
     
     print(f"config {group_name} generation finished.")
 
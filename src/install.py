@@ -1,15 +1,24 @@
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import shutil
 import platform
 import sys
+import zipfile
 from typing import Optional
 
-from .buckyos_kit import ensure_executable, get_execute_name, get_buckyos_root
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .buckyos_kit import ensure_executable, get_execute_name, get_buckyos_root, COPY_BUFSIZE, fast_copyfile, parallel_copytree
 from .project import AppInfo, BuckyProject, WebModuleInfo
 
 src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
 
+_system_name = platform.system()
+_arch_name = platform.machine().lower()
+
 buckyos_root = get_buckyos_root()
 
 pre_install_apps = [
@@ -19,6 +28,15 @@ pre_install_apps = [
     }
 ]
 
+# Shared by every download so requests to the same host reuse TCP/TLS connections;
+# like wget/curl it honors HTTP(S)_PROXY and NO_PROXY from the environment
+_http = requests.Session()
+_http_adapter = HTTPAdapter(pool_maxsize=16, max_retries=Retry(total=3, backoff_factor=0.5))
+_http.mount("https://", _http_adapter)
+_http.mount("http://", _http_adapter)
+# (connect, read) seconds, so a stalled server fails the download instead of hanging it
+_HTTP_TIMEOUT = (10, 60)
+
 def _is_probably_executable(file_path: Path) -> bool:
     # 通过文件头判断是否可能是可执行文件（脚本或 ELF）
     try:
@@ -30,7 +48,7 @@ def _is_probably_executable(file_path: Path) -> bool:
 
 def _ensure_executable_files_in_dir(directory_path: Path) -> None:
     # 仅在 Linux 下扫描目录内文件，必要时补齐可执行权限
-    if platform.system().lower() != "linux":
+    if _system_name != "Linux":
         return
     chmod_count = 0
     for root, _, files in os.walk(directory_path):
@@ -53,7 +71,7 @@ def _copy_dir_with_exec_fix(src_path: Path, target_path: Path) -> None:
         print(f"- Removing {target_path}")
         shutil.rmtree(target_path)
     print(f"+ Copying directory {src_path} => {target_path}")
-    shutil.copytree(src_path, target_path)
+    parallel_copytree(src_path, target_path)
     _ensure_executable_files_in_dir(target_path)
 
 def _is_empty_dir(path: Path) -> bool:
@@ -65,63 +83,152 @@ def _is_empty_dir(path: Path) -> bool:
         return False
 
 
-def unzip_to_dir(zip_path, target_dir):
+# Methods zipfile can decode; anything else (deflate64, zstd, ...) needs libarchive
+_ZIPFILE_METHODS = {zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA}
+
+def _member_target(zip_path, name: str, prefix: str, target_root: str) -> Optional[str]:
+    """Path of archive member name in target_root with the top-level directory stripped, None to skip it"""
+    if not name.startswith(prefix) or name == prefix:
+        return None
+    dst_path = os.path.normpath(os.path.join(target_root, name[len(prefix):]))
+    if not dst_path.startswith(target_root + os.sep):
+        raise ValueError(f"Unsafe path in {zip_path}: {name}")
+    return dst_path
+
+def _zip_members(zf: zipfile.ZipFile, target_dir):
+    """Map each member under the archive's top-level directory to its path in target_dir"""
+    infos = zf.infolist()
+    if not infos:
+        return []
+    prefix = infos[0].filename.split("/", 1)[0] + "/"
+    target_root = os.path.abspath(target_dir)
+    members = []
+    for info in infos:
+        dst_path = _member_target(zf.filename, info.filename, prefix, target_root)
+        if dst_path is not None:
+            members.append((info, dst_path))
+    return members
+
+def _unzip_with_libarchive(zip_path, target_dir):
+    try:
+        import libarchive
+    except ImportError:
+        raise RuntimeError(
+            f"{zip_path} uses a compression method zipfile can't read, install libarchive-c to extract it"
+        ) from None
+
+    target_root = os.path.abspath(target_dir)
+    prefix = None
+    with libarchive.file_reader(os.fspath(zip_path)) as archive:
+        for entry in archive:
+            if prefix is None:
+                prefix = entry.pathname.split("/", 1)[0] + "/"
+            dst_path = _member_target(zip_path, entry.pathname, prefix, target_root)
+            if dst_path is None:
+                continue
+            if entry.isdir:
+                os.makedirs(dst_path, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+            with open(dst_path, "wb") as out:
+                for block in entry.get_blocks():
+                    out.write(block)
+            if entry.mode & 0o111:
+                os.chmod(dst_path, entry.mode & 0o777)
+
+def _extract_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, dst_path):
+    with zf.open(info) as src, open(dst_path, "wb") as out:
+        shutil.copyfileobj(src, out, COPY_BUFSIZE)
+    mode = (info.external_attr >> 16) & 0o777
+    if mode & 0o111:
+        os.chmod(dst_path, mode)
+
+def _extract_members(zip_path, members):
+    # ZipFile objects are not thread-safe, so each worker reads through its own handle
+    with zipfile.ZipFile(zip_path) as zf:
+        for info, dst_path in members:
+            _extract_member(zf, info, dst_path)
+
+def unzip_to_dir(zip_path, target_dir, workers: Optional[int] = None):
     """Extract zip file to target directory, content directly in target directory"""
-    if not os.path.exists(target_dir):
-        os.makedirs(target_dir)
-    
-    # First extract to temporary directory
-    temp_dir = os.path.join(os.path.dirname(zip_path), f"temp_{os.path.basename(zip_path)}")
-    shutil.unpack_archive(zip_path, temp_dir)
-    
-    # Move extracted content to target directory
-    extracted_dir = os.path.join(temp_dir, os.listdir(temp_dir)[0])
-    for item in os.listdir(extracted_dir):
-        src_path = os.path.join(extracted_dir, item)
-        dst_path = os.path.join(target_dir, item)
-        if os.path.isfile(src_path):
-            shutil.copy2(src_path, dst_path)
-        elif os.path.isdir(src_path):
-            shutil.copytree(src_path, dst_path)
-    
-    # Clean up temporary directory
-    shutil.rmtree(temp_dir)
+    os.makedirs(target_dir, exist_ok=True)
+
+    # Members are streamed straight to target_dir with the archive's top-level directory stripped
+    with zipfile.ZipFile(zip_path) as zf:
+        members = _zip_members(zf, target_dir)
+    if any(info.compress_type not in _ZIPFILE_METHODS for info, _ in members):
+        _unzip_with_libarchive(zip_path, target_dir)
+        print(f"Extraction completed: {zip_path} -> {target_dir}")
+        return
+
+    # Create every directory first so the workers only write files
+    files = []
+    dirs = set()
+    for info, dst_path in members:
+        if info.is_dir():
+            dirs.add(dst_path)
+        else:
+            dirs.add(os.path.dirname(dst_path))
+            files.append((info, dst_path))
+    for dir_path in sorted(dirs):
+        os.makedirs(dir_path, exist_ok=True)
+
+    # zlib releases the GIL while inflating, so members decompress in parallel
+    workers = max(1, min(workers or os.cpu_count() or 1, len(files)))
+    chunks = [files[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(_extract_members, zip_path, chunk) for chunk in chunks]:
+            future.result()
+
     print(f"Extraction completed: {zip_path} -> {target_dir}")
 
-def download_file(url, filepath):
-    """Cross-platform file download using system built-in commands"""
-    system = platform.system().lower()
-    
-    if system == "windows":
-        # Windows uses PowerShell's Invoke-WebRequest
-        cmd = f'powershell -Command "Invoke-WebRequest -Uri \'{url}\' -OutFile \'{filepath}\' -UseBasicParsing"'
-    elif system == "darwin":  # macOS
-        # macOS uses curl
-        cmd = f"curl -L -o '{filepath}' '{url}'"
-    else:  # Linux
-        # Linux prioritizes wget, falls back to curl if not available
-        cmd = f"wget -c -L -O '{filepath}' '{url}'"
-    
+def _range_total(resp) -> Optional[int]:
+    # A 416 reports the full size as "Content-Range: bytes */<total>"
+    total = resp.headers.get("Content-Range", "").rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+def download_file(url, filepath, resume=True, expected_length=None):
+    """Download url to filepath over a shared keep-alive pool.
+
+    With resume, a partial file is continued like wget -c; callers must only
+    resume a file that came from the same remote version.
+    """
+    offset = os.path.getsize(filepath) if resume and os.path.exists(filepath) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else None
+
     print(f"Downloading: {url}")
     print(f"Saving to: {filepath}")
-    print(f"Executing command: {cmd}")
-    
-    result = os.system(cmd)
-    if result == 0:
-        print(f"Download completed: {filepath}")
-        return True
-    else:
-        print(f"Download failed, exit code: {result}")
-        # If wget fails, try using curl
-        if system not in ["windows", "darwin"]:
-            print("Trying curl...")
-            curl_cmd = f"curl -L -o '{filepath}' '{url}'"
-            result = os.system(curl_cmd)
-            if result == 0:
-                print(f"Download completed with curl: {filepath}")
+    try:
+        resp = _http.get(url, headers=headers, stream=True, timeout=_HTTP_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"Download failed: {e}")
+        return False
+
+    try:
+        if resp.status_code == 416 and offset:
+            total = expected_length if expected_length is not None else _range_total(resp)
+            if total == offset:
+                # Server has nothing past what we already have
+                print(f"Download completed: {filepath}")
                 return True
-        
+            print(f"Local file does not match the remote size, downloading again: {filepath}")
+            resp.close()
+            return download_file(url, filepath, resume=False, expected_length=expected_length)
+        if resp.status_code not in (200, 206):
+            print(f"Download failed, HTTP status: {resp.status_code}")
+            return False
+        # A 200 means the server ignored Range, so start over
+        with open(filepath, "ab" if resp.status_code == 206 else "wb") as f:
+            for chunk in resp.iter_content(COPY_BUFSIZE):
+                f.write(chunk)
+    except (OSError, requests.RequestException) as e:
+        print(f"Download failed: {e}")
         return False
+    finally:
+        resp.close()
+
+    print(f"Download completed: {filepath}")
+    return True
 
 # def copy_configs(config_group_name):
 #     etc_dir = os.path.join(install_root_dir, "etc")
@@ -136,6 +243,63 @@ def download_file(url, filepath):
 #         #    shutil.copytree(config_path, os.path.join(etc_dir, config_file))
 #         #    print(f"Copied directory {config_path} to {etc_dir}")
 
+def _remote_file_info(url) -> Optional[tuple[Optional[int], Optional[str]]]:
+    """(Content-Length, ETag) from a HEAD request, None if the server can't be asked"""
+    try:
+        resp = _http.head(url, allow_redirects=True, timeout=_HTTP_TIMEOUT)
+    except requests.RequestException:
+        return None
+    if resp.status_code != 200:
+        return None
+    length = resp.headers.get("Content-Length")
+    return (int(length) if length and length.isdigit() else None), resp.headers.get("ETag")
+
+def _read_stamp(path) -> Optional[str]:
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _write_stamp(path, value: str) -> None:
+    with open(path, "w") as f:
+        f.write(value)
+
+def _download_and_unzip(full_id, download_url, download_path, unzip_dir):
+    # <zip>.etag records which remote file the local zip belongs to, <zip>.unzipped what was extracted where
+    etag_path = download_path + ".etag"
+    unzipped_path = download_path + ".unzipped"
+    remote = _remote_file_info(download_url)
+    length, etag = remote if remote is not None else (None, None)
+
+    # Only a local zip stamped with the remote ETag is known to be the same build;
+    # anything else (new upstream build, no ETag) may be an older version under the same name
+    same_build = etag is not None and etag == _read_stamp(etag_path)
+    if not same_build:
+        for stale in (download_path, etag_path, unzipped_path):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+    downloaded = False
+    if same_build and length is not None and os.path.exists(download_path) and os.path.getsize(download_path) == length:
+        print(f"{full_id} is up to date, skip download")
+    else:
+        if etag is not None:
+            _write_stamp(etag_path, etag)
+        if not download_file(download_url, download_path, resume=same_build, expected_length=length):
+            print(f"download {full_id} FAILED")
+            return
+        downloaded = True
+        print(f"download {full_id} OK")
+
+    unzip_stamp = f"{unzip_dir}\n{etag}"
+    if not downloaded and os.path.isdir(unzip_dir) and _read_stamp(unzipped_path) == unzip_stamp:
+        print(f"{full_id} already unzipped to {unzip_dir}, skip unzip")
+        return
+    unzip_to_dir(download_path, unzip_dir)
+    _write_stamp(unzipped_path, unzip_stamp)
+    print(f"unzip {full_id} OK")
+
 def install_buckyos_apps():
     temp_dir = os.environ.get('TEMP') or os.environ.get('TMP') or '/tmp'
     download_dir = os.path.join(temp_dir, "buckyos-apps")
@@ -146,41 +310,44 @@ def install_buckyos_apps():
     
     # check and download app_pkg_zips
     # unzip to dest dir
-    os_name = platform.system().lower()
-    arch = platform.machine().lower()
-    if arch == "x86_64":
-        arch = "amd64"
+    os_name = _system_name.lower()
+    arch = "amd64" if _arch_name == "x86_64" else _arch_name
 
-    if not os.path.exists(download_dir):
-        os.makedirs(download_dir)
+    os.makedirs(download_dir, exist_ok=True)
+    bin_root = os.path.join(install_root_dir, "bin")
     #nightly-apple-aarch64.buckyos-filebrowser-bin.zip
     preifx = f"nightly-{os_name}-{arch}"
     img_prefix = f"nightly-linux-{arch}"
     print(f"app prefix is {preifx}")
+    tasks = []
+    with_bin = os_name == "windows" or os_name == "darwin"
     for app in pre_install_apps:
-        if os_name == "windows" or os_name == "darwin":
-            app_full_id = f"{preifx}.{app['app_id']}-bin.zip"
-            download_url = f"{app['base_url']}{version}/{app_full_id}"
-            download_path = os.path.join(download_dir, f"{app['app_id']}-bin.zip")
-            if download_file(download_url, download_path):
-                print(f"download {app_full_id} OK")
-                unzip_dir = os.path.join(install_root_dir, "bin", f"{app['app_id']}-bin")
-                unzip_to_dir(download_path, unzip_dir)
-                print(f"unzip {app_full_id} OK")
-            else:
-                print(f"download {app_full_id} FAILED")
+        app_id = app['app_id']
+        release_url = f"{app['base_url']}{version}/"
+        if with_bin:
+            app_full_id = f"{preifx}.{app_id}-bin.zip"
+            tasks.append((
+                app_full_id,
+                release_url + app_full_id,
+                os.path.join(download_dir, f"{app_id}-bin.zip"),
+                os.path.join(bin_root, f"{app_id}-bin"),
+            ))
         #https://github.com/buckyos/filebrowser/releases/download/0.4.0/nightly-linux-amd64.buckyos-filebrowser-img.zip
-        app_img_full_id = f"{img_prefix}.{app['app_id']}-img.zip"
-        download_url = f"{app['base_url']}{version}/{app_img_full_id}"
-        download_path = os.path.join(download_dir, f"{app['app_id']}-img.zip")
-        if download_file(download_url, download_path):
-            print(f"download {app_img_full_id} OK")
-            unzip_dir = os.path.join(install_root_dir, "bin", f"{app['app_id']}-img")
-            unzip_to_dir(download_path, unzip_dir)
-            print(f"unzip {app_img_full_id} OK")
-        else:
-            print(f"download {app_img_full_id} FAILED")
+        app_img_full_id = f"{img_prefix}.{app_id}-img.zip"
+        tasks.append((
+            app_img_full_id,
+            release_url + app_img_full_id,
+            os.path.join(download_dir, f"{app_id}-img.zip"),
+            os.path.join(bin_root, f"{app_id}-img"),
+        ))
+
+    # Every archive has its own download path and unzip dir, so they can be fetched side by side
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(tasks)))) as pool:
+        futures = [pool.submit(_download_and_unzip, *task) for task in tasks]
+        for future in as_completed(futures):
+            future.result()
 
+    for app in pre_install_apps:
         print(f"install {app['app_id']} OK")
 
     return
@@ -207,13 +374,14 @@ def update_app(project:BuckyProject,app_name:str,skip_web_module:bool=False,chec
 
     print(f"🎯 Updating modules for app {app_name} to {target_rootfs}")
 
+    rootfs_src = project.resolve_from_base_dir(app_info.rootfs)
     for module_name, module_path in app_info.modules.items():
         if skip_web_module:
             module_info  = project.modules.get(module_name)
             if isinstance(module_info, WebModuleInfo):
                 continue
 
-        src_path = project.resolve_from_base_dir(app_info.rootfs) / module_path
+        src_path = rootfs_src / module_path
         target_path = target_rootfs / module_path
         
         if not module_path.endswith("/"):
@@ -225,8 +393,8 @@ def update_app(project:BuckyProject,app_name:str,skip_web_module:bool=False,chec
             target_path = get_execute_name(target_path)
             
             print(f"+ Copying file {src_path} => {target_path}")
-            shutil.copy(src_path, target_path)
-            ensure_executable(str(target_path))
+            fast_copyfile(src_path, target_path)
+            ensure_executable(target_path)
         else:
             _copy_dir_with_exec_fix(src_path, target_path)
 
@@ -266,21 +434,22 @@ def install_app_data(project:BuckyProject,app_name:str,target_rootfs:Optional[Pa
 
     print(f"📋 Installing data for app {app_name} to {target_rootfs}")
 
+    rootfs_src = project.resolve_from_base_dir(app_info.rootfs)
     for data_path in app_info.data_paths:
-        src_path = project.resolve_from_base_dir(app_info.rootfs) / data_path
+        src_path = rootfs_src / data_path
         target_path = target_rootfs / data_path
         if target_path.exists():
             print(f"⏭️ {target_path} already exists, keep user data.")
             continue;
             
-        if src_path.exists():
-            if src_path.is_file():
-                target_path.parent.mkdir(parents=True, exist_ok=True)
-                print(f"+ Copying file {src_path} => {target_path}")
-                shutil.copy(src_path, target_path)
-            elif src_path.is_dir():
-                _copy_dir_with_exec_fix(src_path, target_path)
-        else:
+        if src_path.is_file():
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            print(f"+ Copying file {src_path} => {target_path}")
+            fast_copyfile(src_path, target_path)
+            shutil.copymode(src_path, target_path)
+        elif src_path.is_dir():
+            _copy_dir_with_exec_fix(src_path, target_path)
+        elif not src_path.exists():
             # 数据路径可能还不存在，创建空目录
             print(f"+ Creating data directory {target_path}")
             target_path.mkdir(parents=True, exist_ok=True)
@@ -293,6 +462,35 @@ def reinstall_app(bucky_project:BuckyProject, app_name:str, skip_web_module:bool
     update_app(bucky_project, app_name, skip_web_module, check_reinstall=False, target_rootfs=target_rootfs)
     print(f"✅ Reinstalling app {app_name} OK")
 
+def _app_target_paths(project: BuckyProject, app_name: str, target_rootfs: Optional[Path]) -> list[Path]:
+    """Every path reinstall_app may remove or write for app_name"""
+    app_info = project.apps[app_name]
+    if target_rootfs is None:
+        root = project.resolve_from_config(app_info.default_target_rootfs)
+    else:
+        root = BuckyProject._expand_path(target_rootfs)
+    rel_paths = [*app_info.modules.values(), *app_info.data_paths, *app_info.clean_paths]
+    return [Path(os.path.normpath(root / rel_path)) for rel_path in rel_paths]
+
+def _apps_touch_disjoint_paths(project: BuckyProject, app_names: list[str], target_rootfs: Optional[Path]) -> bool:
+    paths = [(path, app_name) for app_name in app_names for path in _app_target_paths(project, app_name, target_rootfs)]
+    for path, app_name in paths:
+        for other, other_app in paths:
+            # Clashes if another app's path is the same path or lies underneath it
+            if other_app != app_name and (other == path or path in other.parents):
+                return False
+    return True
+
+def reinstall_apps(bucky_project: BuckyProject, app_names: list[str], skip_web_module: bool = False, target_rootfs: Optional[Path] = None):
+    """Reinstall several apps, side by side when none of them touches another's files"""
+    if len(app_names) < 2 or not _apps_touch_disjoint_paths(bucky_project, app_names, target_rootfs):
+        for app_name in app_names:
+            reinstall_app(bucky_project, app_name, skip_web_module, target_rootfs)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1, len(app_names))) as pool:
+        list(pool.map(lambda name: reinstall_app(bucky_project, name, skip_web_module, target_rootfs), app_names))
+
 INSTALL_HELP = """usage: {prog} [-h] [--all] [reinstall] [--app=APP]
                  [--skip-web] [--target-rootfs=DIR]
 
@@ -361,8 +559,7 @@ def install_main(argv: list[str] | None = None):
     if install_all:
         if app_name is None:
             print("Installing all apps ... 🚀")
-            for app_name in bucky_project.apps.keys():
-                reinstall_app(bucky_project, app_name, skip_web_module, target_rootfs)
+            reinstall_apps(bucky_project, list(bucky_project.apps.keys()), skip_web_module, target_rootfs)
             return
         else:
             reinstall_app(bucky_project, app_name, skip_web_module, target_rootfs)
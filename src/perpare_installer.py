@@ -10,10 +10,15 @@ import shutil
 import json
 import subprocess
 import time
-import glob
 import platform
 from urllib.request import urlretrieve
 from . import prepare_packages
+from .buckyos_kit import fast_copyfile, parallel_copytree
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
 rootfs_dir = os.path.join(src_dir, "rootfs")
@@ -31,55 +36,62 @@ print(f'use buckycli at {buckycli_path}')
 def prepare_meta_db(rootfs_dir):
     # 1 download base meta db
     print(f"# download base meta db from {base_meta_db_url}")
-    os.makedirs(os.path.join(rootfs_dir, "local", "node_daemon", "root_pkg_env","pkgs"), exist_ok=True)
-    root_env_db_path = os.path.join(rootfs_dir, "local", "node_daemon", "root_pkg_env","pkgs","meta_index.db")
+    root_env_pkgs_dir = os.path.join(rootfs_dir, "local", "node_daemon", "root_pkg_env","pkgs")
+    os.makedirs(root_env_pkgs_dir, exist_ok=True)
+    root_env_db_path = os.path.join(root_env_pkgs_dir, "meta_index.db")
     urlretrieve(base_meta_db_url, root_env_db_path)
     # subprocess.run(["wget",base_meta_db_url,"-O",root_env_db_path], check=True)
     print(f"# download base meta db to {root_env_db_path}")
     # 2 scan packed pkgs dir, add pkg_meta_info to meta db
     packed_pkgs_dir = os.path.join(rootfs_dir, "bin")
     print(f"# packed_pkgs_dir: {packed_pkgs_dir}")
-    pkg_items = glob.glob(os.path.join(packed_pkgs_dir, "*"))
-    for pkg_item in pkg_items:
-        print(f"# add pkg_meta_info to meta db from {pkg_item}")
-        if os.path.isdir(pkg_item):
-            pkg_item = os.path.join(pkg_item, "pkg_meta.json")
-            if os.path.exists(pkg_item):
-                subprocess.run([buckycli_path,"set_pkg_meta",pkg_item,root_env_db_path], check=True)
-                print(f"# add pkg_meta_info to meta db from {pkg_item}")
-        else:
-            # Why does this scenario exist?
-            if pkg_item.endswith(".json") and not pkg_item.endswith("pkg.cfg.json"):
-                subprocess.run([buckycli_path,"set_pkg_meta",pkg_item,root_env_db_path], check=True)
-                print(f"# add pkg_meta_info to meta db from {pkg_item}")
+    # DirEntry carries the type from readdir, so no extra stat per item
+    with os.scandir(packed_pkgs_dir) as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir():
+                pkg_item = os.path.join(entry.path, "pkg_meta.json")
+                if os.path.exists(pkg_item):
+                    subprocess.run([buckycli_path,"set_pkg_meta",pkg_item,root_env_db_path], check=True)
+                    print(f"# add pkg_meta_info to meta db from {pkg_item}")
+            else:
+                # Why does this scenario exist?
+                if entry.name.endswith(".json") and not entry.name.endswith("pkg.cfg.json"):
+                    subprocess.run([buckycli_path,"set_pkg_meta",entry.path,root_env_db_path], check=True)
+                    print(f"# add pkg_meta_info to meta db from {entry.path}")
+
+    root_fileobj_path = os.path.join(root_env_pkgs_dir, "meta_index.db.fileobj")
+    with open(root_fileobj_path, "rb") as f:
+        raw = f.read()
+    fileobj = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
-    fileobj_path = os.path.join(rootfs_dir, "local", "node_daemon", "root_pkg_env","pkgs", "meta_index.db.fileobj")
-    fileobj = json.load(open(fileobj_path))
-    
     current_time = int(time.time())
     fileobj["create_time"] = current_time
-    json.dump(fileobj, open(fileobj_path, "w"))
+    # Serialize once; the repo-service copy is byte-identical
+    with open(root_fileobj_path, "wb") as f:
+        f.write(orjson.dumps(fileobj) if orjson is not None else json.dumps(fileobj).encode("utf-8"))
     fileobj_path = os.path.join(rootfs_dir, "data", "repo-service", "default_meta_index.db.fileobj")
-    json.dump(fileobj, open(fileobj_path, "w"))
+    fast_copyfile(root_fileobj_path, fileobj_path)
     print(f"# update fileobj create_time to {current_time} for {fileobj_path}")
-    os.makedirs(os.path.join(rootfs_dir, "bin", "pkgs"), exist_ok=True)
-    shutil.copy(root_env_db_path, os.path.join(rootfs_dir, "bin", "pkgs", "meta_index.db"))
-    shutil.copy(root_env_db_path, os.path.join(rootfs_dir, "data", "repo-service", "default_meta_index.db"))
-    print(f"# save meta db to {os.path.join(rootfs_dir, 'bin', 'pkgs', 'meta_index.db')}")
+    bin_db_path = os.path.join(packed_pkgs_dir, "pkgs", "meta_index.db")
+    os.makedirs(os.path.dirname(bin_db_path), exist_ok=True)
+    fast_copyfile(root_env_db_path, bin_db_path)
+    fast_copyfile(root_env_db_path, os.path.join(rootfs_dir, "data", "repo-service", "default_meta_index.db"))
+    print(f"# save meta db to {bin_db_path}")
 
 def prepare_installer(target_dir, channel, os_name, arch, version, builddate):
-    if not os.path.exists(target_dir):
-        os.makedirs(target_dir)
-    shutil.copytree(rootfs_dir, target_dir, dirs_exist_ok=True)
+    parallel_copytree(rootfs_dir, target_dir, dirs_exist_ok=True)
     print(f"# copy rootfs to {target_dir}")
 
     bin_dir = os.path.join(target_dir, "bin")
     # write pkg.cfg.json to bin_dir
     pkg_cfg_path = os.path.join(src_dir, "publish", "buckyos_pkgs","pkg.cfg.json")
+    bin_pkg_cfg_path = os.path.join(bin_dir, "pkg.cfg.json")
     pkg_cfg = json.load(open(pkg_cfg_path))
     pkg_cfg["prefix"] = f"${channel}-{os_name}-{arch}"
     pkg_cfg["parent"] = None
-    json.dump(pkg_cfg, open(os.path.join(bin_dir, "pkg.cfg.json"), "w"))
+    json.dump(pkg_cfg, open(bin_pkg_cfg_path, "w"))
     print(f"# write pkg.cfg.json to {bin_dir} OK ")
 
     # perpare packages
@@ -96,21 +108,22 @@ def prepare_installer(target_dir, channel, os_name, arch, version, builddate):
         pkg_cfg["parent"] = "c:\\buckyos\\local\\node_daemon\\root_pkg_env"
     else:
         pkg_cfg["parent"] = "/opt/buckyos/local/node_daemon/root_pkg_env"
-    json.dump(pkg_cfg, open(os.path.join(bin_dir, "pkg.cfg.json"), "w"))
+    json.dump(pkg_cfg, open(bin_pkg_cfg_path, "w"))
 
     os.remove(os.path.join(bin_dir, "pkgs", "meta_index.db"))
     print(f"# remove meta_index.db from {bin_dir}")
 
     clean_dir = os.path.join(target_dir, "etc")
     print(f"clean all .pem and .toml files and start_config.json in {clean_dir}")
-    for file in glob.glob(os.path.join(clean_dir, "*.pem")):
-        os.remove(file)
-    for file in glob.glob(os.path.join(clean_dir, "*.toml")):
-        os.remove(file)
+    # One directory listing instead of a glob per pattern
+    with os.scandir(clean_dir) as it:
+        for entry in it:
+            if not entry.name.startswith(".") and entry.name.endswith((".pem", ".toml", ".zone.json")):
+                os.remove(entry.path)
     os.remove(os.path.join(clean_dir, "start_config.json"))
     os.remove(os.path.join(clean_dir, "node_identity.json"))
-    for file in glob.glob(os.path.join(clean_dir, "*.zone.json")):
-        os.remove(file)
-    os.remove(os.path.join(clean_dir, "scheduler", "boot.template.toml"))
-    shutil.move(os.path.join(clean_dir, "scheduler", "nightly.template.toml"), os.path.join(clean_dir, "scheduler", "boot.template.toml"))
+    scheduler_dir = os.path.join(clean_dir, "scheduler")
+    boot_template_path = os.path.join(scheduler_dir, "boot.template.toml")
+    os.remove(boot_template_path)
+    shutil.move(os.path.join(scheduler_dir, "nightly.template.toml"), boot_template_path)
     shutil.move(os.path.join(clean_dir, "machine.json"), os.path.join(clean_dir, "machine_config.json"))
\ No newline at end of file
@@ -1,10 +1,9 @@
 import os
 from pathlib import Path
-import shutil
 import platform
 from typing import Optional
 from .project import WebModuleInfo, RustModuleInfo, BuckyProject
-from .buckyos_kit import get_execute_name
+from .buckyos_kit import get_execute_name, fast_copyfile, sync_tree
 from .build_rust import is_cross_compile_target
 
 _system_name = platform.system()
@@ -16,6 +15,21 @@ def copy_rust_module(project: BuckyProject, module_name: str, rust_target: Optio
     if not isinstance(module_info, RustModuleInfo):
         raise ValueError(f"Rust module {module_name} is not a RustModuleInfo")
 
+    # 构建源文件路径
+    # 当需要交叉编译时（get_cross_compile_env_vars_by_target 返回非 None），
+    # cargo 会使用 --target 参数，编译结果会放在 {target_dir}/{target}/release/
+    # 否则放在 {target_dir}/release/
+    use_target_subdir = False
+    if rust_target:
+        use_target_subdir = is_cross_compile_target(rust_target)
+
+    rust_target_dir = project.resolve_from_config(project.rust_target_dir)
+    if use_target_subdir:
+        src_file = rust_target_dir / rust_target / "release" / module_name
+    else:
+        src_file = rust_target_dir / "release" / module_name
+    src_file = get_execute_name(src_file)
+
     for app_info in project.apps.values():
         if module_name not in app_info.modules:
             continue
@@ -23,21 +37,6 @@ def copy_rust_module(project: BuckyProject, module_name: str, rust_target: Optio
         
         print(f'* Copying rust module to app {app_info.name}...')
         
-        # 构建源文件路径
-        # 当需要交叉编译时（get_cross_compile_env_vars_by_target 返回非 None），
-        # cargo 会使用 --target 参数，编译结果会放在 {target_dir}/{target}/release/
-        # 否则放在 {target_dir}/release/
-        use_target_subdir = False
-        if rust_target:
-            use_target_subdir = is_cross_compile_target(rust_target)
-
-        rust_target_dir = project.resolve_from_config(project.rust_target_dir)
-        if use_target_subdir:
-            src_file = rust_target_dir / rust_target / "release" / module_name
-        else:
-            src_file = rust_target_dir / "release" / module_name
-        src_file = get_execute_name(src_file)
-        
         # 目标路径：rootfs/module_path/module_name
         
         if not module_path.endswith("/"):
@@ -49,7 +48,12 @@ def copy_rust_module(project: BuckyProject, module_name: str, rust_target: Optio
         real_target = get_execute_name(real_target)
         
         print(f'+ Copying rust executable: {src_file} => {real_target}')
-        shutil.copy(src_file, real_target)
+        # A real copy, never a hardlink: the chmod below and any later in-place step on the
+        # rootfs binary (strip, signing) must not reach cargo's output or other apps' copies.
+        # Drop the target first in case an older build left a link there.
+        if os.path.lexists(real_target):
+            os.unlink(real_target)
+        fast_copyfile(src_file, real_target)
         # 确保可执行权限
         os.chmod(real_target, 0o755)
 
@@ -71,13 +75,10 @@ def copy_web_module(project: BuckyProject, module_name: str):
         print(f'* Copying web module to app {app_info.name}...')
         real_target_dir = project.resolve_from_base_dir(app_info.rootfs) / module_path
         
-        # 如果目标目录存在，先删除
-        if os.path.exists(real_target_dir):
-            print(f'- Removing existing directory: {real_target_dir}')
-            shutil.rmtree(real_target_dir)
-        
-        print(f'+ Copying web module dist: {dist_dir} => {real_target_dir}')
-        shutil.copytree(dist_dir, real_target_dir, copy_function=shutil.copyfile)
+        # 增量同步：只复制有变化的文件，并删除 dist 中已不存在的文件
+        print(f'+ Syncing web module dist: {dist_dir} => {real_target_dir}')
+        copied, removed = sync_tree(dist_dir, real_target_dir)
+        print(f'  {copied} files copied, {removed} stale entries removed')
 
 
 def copy_build_results(
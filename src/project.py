@@ -1,17 +1,70 @@
 from dataclasses import dataclass, field, asdict
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
+import copy
 import platform
 import tempfile
 import json
 import os
 
-if platform.system() == "Windows":
-    _temp_dir = tempfile.gettempdir()
-else:
-    _temp_dir = "/tmp/"
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+try:
+    import yaml
+    # LibYAML's C loader/dumper when PyYAML was built with it, same safe semantics
+    _YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    _YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+except ImportError:
+    yaml = None
+
+def _load_json_file(config_file: Path) -> Dict[str, Any]:
+    raw = config_file.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _load_yaml_file(config_file: Path) -> Dict[str, Any]:
+    if yaml is None:
+        raise ImportError(
+            "PyYAML is required to load YAML files: pip install pyyaml"
+        )
+    with open(config_file, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_YAML_LOADER)
+    return {} if data is None else data
+
+def _dump_json_file(config_file: Path, data: Dict[str, Any]) -> None:
+    if orjson is not None:
+        with open(config_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(config_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def _dump_yaml_file(config_file: Path, data: Dict[str, Any]) -> None:
+    if yaml is None:
+        raise ImportError(
+            "PyYAML is required to save YAML files: pip install pyyaml"
+        )
+    with open(config_file, 'w', encoding='utf-8') as f:
+        yaml.dump(data, f, Dumper=_YAML_DUMPER, allow_unicode=True, default_flow_style=False)
+
+# (resolved path, mtime_ns, size) => parsed config data
+_CONFIG_DATA_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+# config file suffix => reader / writer
+_LOADERS = {'.json': _load_json_file, '.yaml': _load_yaml_file, '.yml': _load_yaml_file}
+_DUMPERS = {'.json': _dump_json_file, '.yaml': _dump_yaml_file, '.yml': _dump_yaml_file}
+
+# Paths are immutable, so apps repeating the same rootfs/data path strings can share one object
+@lru_cache(maxsize=1024)
+def _cached_path(path: str) -> Path:
+    return Path(path)
+
+_temp_dir: Path = Path(tempfile.gettempdir()) if platform.system() == "Windows" else Path("/tmp")
+
+@dataclass(slots=True)
 class WebModuleInfo:
     name: str
     src_dir: Path
@@ -22,7 +75,7 @@ class WebModuleInfo:
         """Create WebModuleInfo from dictionary"""
         return cls(
             name=data['name'],
-            src_dir=Path(data['src_dir']),
+            src_dir=_cached_path(data['src_dir']),
             type=data.get('type', 'web')
         )
     
@@ -33,7 +86,7 @@ class WebModuleInfo:
             'src_dir': str(self.src_dir)
         }
 
-@dataclass
+@dataclass(slots=True)
 class RustModuleInfo:
     name: str
     file_only: bool = False
@@ -55,7 +108,10 @@ class RustModuleInfo:
             'file_only': self.file_only
         }
 
-@dataclass
+# module class => "type" tag written by BuckyProject.to_dict
+_MODULE_TYPE_TAGS = {WebModuleInfo: 'web', RustModuleInfo: 'rust'}
+
+@dataclass(slots=True)
 class AppInfo:
     name: str
     rootfs: Path # 相对Project的base_dir的相对路径
@@ -69,17 +125,13 @@ class AppInfo:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AppInfo':
         """Create AppInfo from dictionary"""
-        modules = {}
-        for mod_name, mod_path in data.get('modules', {}).items():
-            modules[mod_name] = mod_path
-        
         return cls(
             name=data['name'],
-            rootfs=Path(data['rootfs']),
-            default_target_rootfs=Path(data['default_target_rootfs']),
-            modules=modules,
-            data_paths=[Path(p) for p in data.get('data_paths', [])],
-            clean_paths=[Path(p) for p in data.get('clean_paths', [])]
+            rootfs=_cached_path(data['rootfs']),
+            default_target_rootfs=_cached_path(data['default_target_rootfs']),
+            modules=dict(data.get('modules', ())),
+            data_paths=[_cached_path(p) for p in data.get('data_paths', ())],
+            clean_paths=[_cached_path(p) for p in data.get('clean_paths', ())]
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -93,7 +145,7 @@ class AppInfo:
             'clean_paths': [str(p) for p in self.clean_paths]
         }
 
-@dataclass
+@dataclass(slots=True)
 class BuckyProject:
     """BuckyOS project configuration"""
     name: str
@@ -114,7 +166,7 @@ class BuckyProject:
         else:
             self.config_dir = Path(self.config_dir)
         if self.rust_target_dir is None:
-            self.rust_target_dir = Path(_temp_dir) / "rust_build" / self.name
+            self.rust_target_dir = _temp_dir / "rust_build" / self.name
 
     def add_web_module(self, module: str, info: WebModuleInfo) -> None:
         """Add a web module"""
@@ -136,27 +188,24 @@ class BuckyProject:
     def _load_config_data(config_file: str | Path) -> Dict[str, Any]:
         config_file = Path(config_file).expanduser().resolve()
 
-        if not config_file.exists():
-            raise FileNotFoundError(f"Config file not found: {config_file}")
+        try:
+            st = config_file.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Config file not found: {config_file}") from None
 
         suffix = config_file.suffix.lower()
-
-        if suffix == '.json':
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        elif suffix in ['.yaml', '.yml']:
-            try:
-                import yaml
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                return {} if data is None else data
-            except ImportError:
-                raise ImportError(
-                    "PyYAML is required to load YAML files: pip install pyyaml"
-                )
-        else:
+        loader = _LOADERS.get(suffix)
+        if loader is None:
             raise ValueError(f"Unsupported config file format: {suffix}, only .json, .yaml, .yml are supported")
 
+        # Any edit changes mtime or size; callers get a copy so they can't alter the cached data
+        key = (str(config_file), st.st_mtime_ns, st.st_size)
+        data = _CONFIG_DATA_CACHE.get(key)
+        if data is None:
+            data = loader(config_file)
+            _CONFIG_DATA_CACHE[key] = data
+        return copy.deepcopy(data)
+
     @staticmethod
     def _deep_merge_dicts(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
         merged = dict(base)
@@ -287,10 +336,9 @@ class BuckyProject:
         modules_dict = {}
         for module_name, module_info in self.modules.items():
             module_dict = module_info.to_dict()
-            if isinstance(module_info, WebModuleInfo):
-                module_dict['type'] = 'web'
-            elif isinstance(module_info, RustModuleInfo):
-                module_dict['type'] = 'rust'
+            type_tag = _MODULE_TYPE_TAGS.get(type(module_info))
+            if type_tag is not None:
+                module_dict['type'] = type_tag
             modules_dict[module_name] = module_dict
         
         apps_dict = {}
@@ -319,23 +367,11 @@ class BuckyProject:
         """
         config_file = Path(config_file)
         suffix = config_file.suffix.lower()
-        
-        data = self.to_dict()
-        
-        if suffix == '.json':
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        elif suffix in ['.yaml', '.yml']:
-            try:
-                import yaml
-                with open(config_file, 'w', encoding='utf-8') as f:
-                    yaml.safe_dump(data, f, allow_unicode=True, default_flow_style=False)
-            except ImportError:
-                raise ImportError(
-                    "PyYAML is required to save YAML files: pip install pyyaml"
-                )
-        else:
+        dumper = _DUMPERS.get(suffix)
+        if dumper is None:
             raise ValueError(f"Unsupported config file format: {suffix}, only .json, .yaml, .yml are supported")
+
+        dumper(config_file, self.to_dict())
         
         print(f"Config saved to: {config_file}")
     @classmethod
@@ -0,0 +1,76 @@
+import os
+import re
+import json
+from typing import Dict, Iterator, List, Tuple
+
+_GH_DEP_RE = re.compile(r'github:|git\+https://github\.com|git\+ssh://git@github\.com', re.IGNORECASE)
+
+# (abspath, mtime_ns, size) => GitHub dependency names; any edit to package.json changes the key
+_cache: Dict[Tuple[str, int, int], List[str]] = {}
+
+
+def _iter_dependencies_streaming(f) -> Iterator[Tuple[str, object]]:
+    """Yield top-level "dependencies" entries with ijson, stopping once that object closes"""
+    import ijson
+
+    name = None
+    try:
+        for prefix, event, value in ijson.parse(f):
+            if prefix == 'dependencies':
+                if event == 'map_key':
+                    name = value
+                elif event == 'end_map':
+                    return
+            elif event == 'string' and name is not None and prefix == f'dependencies.{name}':
+                yield name, value
+    except ijson.JSONError as e:
+        # Surface parse errors the same way json.load does
+        raise ValueError(str(e)) from e
+
+
+def _iter_dependencies(package_json_path: str) -> Iterator[Tuple[str, object]]:
+    try:
+        import ijson  # noqa: F401
+    except ImportError:
+        with open(package_json_path, 'r', encoding='utf-8') as f:
+            pkg = json.load(f)
+        yield from pkg.get('dependencies', {}).items()
+        return
+
+    with open(package_json_path, 'rb') as f:
+        yield from _iter_dependencies_streaming(f)
+
+
+def get_github_dependencies(package_json_path: str) -> List[str]:
+    """Extract GitHub dependencies from package.json
+
+    Recognizes the following formats:
+    - "github:owner/repo"
+    - "git+https://github.com/..."
+    - "git+ssh://git@github.com/..."
+
+    Only the "dependencies" object is read; with ijson installed the rest of the file is not parsed.
+    Results are cached per (path, mtime) for the life of the process.
+    """
+    try:
+        st = os.stat(package_json_path)
+    except OSError:
+        return []
+
+    key = (os.path.abspath(package_json_path), st.st_mtime_ns, st.st_size)
+    cached = _cache.get(key)
+    if cached is not None:
+        return list(cached)
+
+    try:
+        github_deps = []
+        for name, version in _iter_dependencies(package_json_path):
+            # Check if it's a GitHub dependency
+            if isinstance(version, str) and _GH_DEP_RE.search(version):
+                github_deps.append(name)
+
+        _cache[key] = github_deps
+        return list(github_deps)
+    except (ValueError, IOError) as e:
+        print(f"Warning: unable to read package.json: {e}")
+        return []
@@ -0,0 +1,426 @@
+import importlib
+import os
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+buckyos_kit = importlib.import_module("src.buckyos_kit")
+
+
+@unittest.skipIf(os.name == "nt", "POSIX permission bits only")
+class PermissionHelperTests(unittest.TestCase):
+    def test_ensure_executable_adds_execute_bits(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / "daemon"
+            file_path.write_text("#!/bin/sh\n", encoding="utf-8")
+            file_path.chmod(0o644)
+
+            buckyos_kit.ensure_executable(str(file_path))
+
+            self.assertEqual(stat.S_IMODE(file_path.stat().st_mode), 0o755)
+
+    def test_ensure_executable_rejects_directory(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(ValueError):
+                buckyos_kit.ensure_executable(tmp_dir)
+
+    def test_ensure_executable_reports_missing_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(FileNotFoundError):
+                buckyos_kit.ensure_executable(os.path.join(tmp_dir, "missing"))
+
+    def test_ensure_directory_accessible_opens_whole_tree(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir) / "data"
+            nested = root / "nested"
+            nested.mkdir(parents=True)
+            file_path = nested / "config.json"
+            file_path.write_text("{}", encoding="utf-8")
+            file_path.chmod(0o600)
+
+            buckyos_kit.ensure_directory_accessible(str(root))
+
+            for path in (root, nested, file_path):
+                self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o777)
+
+    def test_ensure_directory_accessible_enters_unreadable_directories(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir) / "data"
+            locked = root / "locked"
+            inner = locked / "inner"
+            inner.mkdir(parents=True)
+            file_path = inner / "config.json"
+            file_path.write_text("{}", encoding="utf-8")
+            file_path.chmod(0o600)
+            inner.chmod(0o700)
+            locked.chmod(0o000)
+
+            buckyos_kit.ensure_directory_accessible(str(root))
+
+            for path in (root, locked, inner, file_path):
+                self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o777)
+
+    def test_ensure_directory_accessible_skips_symlink_targets(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            outside = Path(tmp_dir) / "outside.txt"
+            outside.write_text("keep", encoding="utf-8")
+            outside.chmod(0o600)
+            root = Path(tmp_dir) / "data"
+            root.mkdir()
+            (root / "link").symlink_to(outside)
+
+            buckyos_kit.ensure_directory_accessible(str(root))
+
+            self.assertEqual(stat.S_IMODE(outside.stat().st_mode), 0o600)
+            self.assertEqual(stat.S_IMODE(root.stat().st_mode), 0o777)
+
+
+class FastCopyfileTests(unittest.TestCase):
+    def test_copies_content(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = Path(tmp_dir) / "meta_index.db"
+            src.write_bytes(os.urandom(300_000))
+            dst = Path(tmp_dir) / "copy.db"
+            dst.write_bytes(b"stale content that is longer than nothing")
+
+            self.assertEqual(buckyos_kit.fast_copyfile(src, dst), dst)
+            self.assertEqual(dst.read_bytes(), src.read_bytes())
+
+            with self.assertRaises(buckyos_kit.shutil.SameFileError):
+                buckyos_kit.fast_copyfile(src, src)
+
+    @unittest.skipUnless(hasattr(os, "copy_file_range"), "requires os.copy_file_range")
+    def test_falls_back_when_copy_file_range_is_refused(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = Path(tmp_dir) / "app"
+            src.write_bytes(b"binary" * 1000)
+            dst = Path(tmp_dir) / "copy"
+            refused = OSError(buckyos_kit.errno.EXDEV, "cross-device")
+            with patch.object(buckyos_kit.os, "copy_file_range", side_effect=refused):
+                buckyos_kit.fast_copyfile(src, dst)
+
+            self.assertEqual(dst.read_bytes(), src.read_bytes())
+
+
+class LinkOrCopyfileTests(unittest.TestCase):
+    def test_links_and_replaces_existing_target(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = Path(tmp_dir) / "node_daemon"
+            src.write_bytes(b"new build")
+            dst = Path(tmp_dir) / "rootfs_node_daemon"
+            dst.write_bytes(b"old build")
+
+            buckyos_kit.link_or_copyfile(src, dst)
+            buckyos_kit.link_or_copyfile(src, dst)
+            buckyos_kit.link_or_copyfile(src, src)
+
+            self.assertTrue(os.path.samefile(src, dst))
+            self.assertEqual(src.read_bytes(), b"new build")
+
+    def test_falls_back_to_copy(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = Path(tmp_dir) / "node_daemon"
+            src.write_bytes(b"build")
+            dst = Path(tmp_dir) / "copy"
+            cross_device = OSError(buckyos_kit.errno.EXDEV, "cross-device link")
+            with patch.object(buckyos_kit.os, "link", side_effect=cross_device):
+                buckyos_kit.link_or_copyfile(src, dst)
+
+            self.assertFalse(os.path.samefile(src, dst))
+            self.assertEqual(dst.read_bytes(), b"build")
+
+
+class ParallelCopytreeTests(unittest.TestCase):
+    def make_tree(self, root: Path):
+        (root / "a" / "b").mkdir(parents=True)
+        (root / "empty").mkdir()
+        (root / "top.txt").write_text("top", encoding="utf-8")
+        (root / "a" / "b" / "deep.bin").write_bytes(b"\x00\x01")
+        for i in range(20):
+            (root / "a" / f"{i}.js").write_text(str(i), encoding="utf-8")
+
+    def test_copies_same_tree_as_copytree(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = Path(tmp_dir) / "src"
+            self.make_tree(src)
+
+            buckyos_kit.parallel_copytree(src, Path(tmp_dir) / "dst", workers=4)
+
+            def listing(root):
+                return sorted(
+                    (str(p.relative_to(root)), p.read_bytes() if p.is_file() else None) for p in root.rglob("*")
+                )
+
+            self.assertEqual(listing(Path(tmp_dir) / "dst"), listing(src))
+
+    def test_existing_destination_requires_dirs_exist_ok(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = Path(tmp_dir) / "src"
+            dst = Path(tmp_dir) / "dst"
+            self.make_tree(src)
+            dst.mkdir()
+            (dst / "top.txt").write_text("old", encoding="utf-8")
+
+            with self.assertRaises(FileExistsError):
+                buckyos_kit.parallel_copytree(src, dst)
+            buckyos_kit.parallel_copytree(src, dst, dirs_exist_ok=True)
+
+            self.assertEqual((dst / "top.txt").read_text(encoding="utf-8"), "top")
+
+    @unittest.skipIf(os.name == "nt", "creating symlinks needs extra privileges")
+    def test_copy_errors_propagate(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = Path(tmp_dir) / "src"
+            self.make_tree(src)
+            (src / "dangling").symlink_to(Path(tmp_dir) / "missing")
+
+            with self.assertRaises(FileNotFoundError):
+                buckyos_kit.parallel_copytree(src, Path(tmp_dir) / "dst")
+
+
+class SyncTreeTests(unittest.TestCase):
+    def test_copies_only_changed_files_and_removes_orphans(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dist = Path(tmp_dir) / "dist"
+            (dist / "assets").mkdir(parents=True)
+            (dist / "index.html").write_text("<html>", encoding="utf-8")
+            (dist / "assets" / "app.js").write_text("v1", encoding="utf-8")
+            target = Path(tmp_dir) / "rootfs" / "web"
+
+            self.assertEqual(buckyos_kit.sync_tree(dist, target), (2, 0))
+            self.assertEqual(buckyos_kit.sync_tree(dist, target), (0, 0))
+
+            (dist / "assets" / "app.js").write_text("v2 build", encoding="utf-8")
+            (dist / "index.html").unlink()
+            (dist / "assets" / "index.html").mkdir()
+            (target / "assets" / "old.js").write_text("old", encoding="utf-8")
+
+            self.assertEqual(buckyos_kit.sync_tree(dist, target), (1, 2))
+            self.assertEqual((target / "assets" / "app.js").read_text(encoding="utf-8"), "v2 build")
+            self.assertEqual(sorted(p.name for p in target.rglob("*")), ["app.js", "assets", "index.html"])
+            self.assertTrue((target / "assets" / "index.html").is_dir())
+
+
+class BuckyosDirTests(unittest.TestCase):
+    def test_app_dirs_match_os_path_join(self):
+        root = buckyos_kit.get_buckyos_root()
+
+        self.assertEqual(buckyos_kit.get_user_data_dir("alice"), os.path.join(root, "data", "alice"))
+        self.assertEqual(buckyos_kit.get_app_data_dir("files", "alice"), os.path.join(root, "data", "alice", "files"))
+        self.assertEqual(buckyos_kit.get_app_cache_dir("files", "alice"), os.path.join(root, "cache", "alice", "files"))
+        self.assertEqual(
+            buckyos_kit.get_app_local_cache_dir("files", "alice"), os.path.join(root, "tmp", "alice", "files")
+        )
+
+    def test_buckyos_root_follows_environment_changes(self):
+        with patch.dict(buckyos_kit.os.environ, {"BUCKYOS_ROOT": "/srv/buckyos-a"}):
+            self.assertEqual(buckyos_kit.get_buckyos_root(), "/srv/buckyos-a")
+            self.assertEqual(buckyos_kit.get_app_data_dir("files", "alice"), os.path.join("/srv/buckyos-a", "data", "alice", "files"))
+            buckyos_kit.os.environ["BUCKYOS_ROOT"] = "/srv/buckyos-b"
+            self.assertEqual(buckyos_kit.get_buckyos_root(), "/srv/buckyos-b")
+            self.assertEqual(buckyos_kit.get_app_data_dir("files", "alice"), os.path.join("/srv/buckyos-b", "data", "alice", "files"))
+            del buckyos_kit.os.environ["BUCKYOS_ROOT"]
+            self.assertEqual(buckyos_kit.get_buckyos_root(), buckyos_kit._default_buckyos_root())
+
+
+class ExecuteNameTests(unittest.TestCase):
+    def test_execute_name_follows_current_platform(self):
+        with patch.object(buckyos_kit, "_system_name", "Windows"):
+            self.assertEqual(buckyos_kit.get_execute_name(Path("bin") / "buckycli"), str(Path("bin") / "buckycli") + ".exe")
+            self.assertEqual(buckyos_kit.get_execute_name("run.bat"), "run.bat")
+        with patch.object(buckyos_kit, "_system_name", "Linux"):
+            self.assertEqual(buckyos_kit.get_execute_name(Path("bin") / "buckycli"), str(Path("bin") / "buckycli"))
+
+    def test_session_token_env_key(self):
+        self.assertEqual(buckyos_kit.get_session_token_env_key("alice-home-station", False), "ALICE_HOME_STATION_SESSION_TOKEN")
+        self.assertEqual(buckyos_kit.get_session_token_env_key("alice-home-station", True), "ALICE_HOME_STATION_TOKEN")
+
+
+class KillProcessTests(unittest.TestCase):
+    def test_kill_process_signals_every_matching_pid(self):
+        with patch.object(buckyos_kit, "_system_name", "Linux"), patch.object(
+            buckyos_kit, "_find_pids_by_name", return_value=[101, 102]
+        ), patch.object(buckyos_kit.os, "kill") as kill_mock, patch("builtins.print"):
+            buckyos_kit.kill_process("node_daemon")
+
+        self.assertEqual(
+            [call.args for call in kill_mock.call_args_list],
+            [(101, buckyos_kit.signal.SIGTERM), (102, buckyos_kit.signal.SIGTERM)],
+        )
+
+    @unittest.skipUnless(os.path.isdir("/proc/self") and shutil.which("sleep"), "requires procfs and sleep")
+    def test_find_pids_matches_names_longer_than_comm(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            long_name = "buckyos-filebrowser"
+            exe_path = os.path.join(tmp_dir, long_name)
+            shutil.copy2(shutil.which("sleep"), exe_path)
+            child = subprocess.Popen([exe_path, "30"])
+            try:
+                # comm is only set once the child has exec'd
+                for _ in range(100):
+                    with open(f"/proc/{child.pid}/comm", encoding="utf-8") as f:
+                        if f.read().strip() == long_name[:15]:
+                            break
+                    time.sleep(0.01)
+                with patch.object(buckyos_kit, "_system_name", "Linux"):
+                    self.assertEqual(buckyos_kit._find_pids_by_name(long_name), [child.pid])
+                    self.assertEqual(buckyos_kit._find_pids_by_name(long_name[:15]), [child.pid])
+                    self.assertEqual(buckyos_kit._find_pids_by_name(long_name + "-x"), [])
+            finally:
+                child.kill()
+                child.wait()
+
+    def test_find_pids_without_proc_uses_pgrep_full_match_for_long_names(self):
+        result = subprocess.CompletedProcess([], 0, stdout="101\n")
+        with patch.object(buckyos_kit, "_system_name", "Darwin"), patch.object(
+            buckyos_kit.subprocess, "run", return_value=result
+        ) as run_mock:
+            self.assertEqual(buckyos_kit._find_pids_by_name("node_daemon"), [101])
+            self.assertEqual(run_mock.call_args.args[0], ["pgrep", "-x", "node_daemon"])
+            self.assertEqual(buckyos_kit._find_pids_by_name("buckyos-filebrowser"), [101])
+            self.assertEqual(run_mock.call_args.args[0], ["pgrep", "-f", "(^|/)buckyos-filebrowser( |$)"])
+
+
+class NohupStartTests(unittest.TestCase):
+    def test_nohup_start_spawns_argv_without_shell(self):
+        with patch.object(buckyos_kit, "_system_name", "Linux"), patch.object(
+            buckyos_kit.subprocess, "Popen"
+        ) as popen_mock, patch("builtins.print"):
+            buckyos_kit.nohup_start("/opt/buckyos/bin/node_daemon --enable_active", {"BUCKYOS_ROOT": "/opt/buckyos"})
+
+        args, kwargs = popen_mock.call_args
+        self.assertEqual(args[0], ["/opt/buckyos/bin/node_daemon", "--enable_active"])
+        self.assertNotIn("shell", kwargs)
+        self.assertTrue(kwargs["start_new_session"])
+        self.assertEqual(kwargs["stdout"], buckyos_kit.subprocess.DEVNULL)
+        self.assertEqual(kwargs["env"]["BUCKYOS_ROOT"], "/opt/buckyos")
+
+    @unittest.skipIf(os.name == "nt", "uses a POSIX shell command")
+    def test_wait_process_returns_exit_code_and_forgets_child(self):
+        with patch("builtins.print"):
+            process = buckyos_kit.nohup_start(["sh", "-c", "exit 3"])
+        self.assertIn(process.pid, buckyos_kit._children)
+
+        self.assertEqual(buckyos_kit.wait_process(process, timeout=10), 3)
+        self.assertNotIn(process.pid, buckyos_kit._children)
+
+
+class ProcessSnapshotTests(unittest.TestCase):
+    PS_OUTPUT = (
+        "    PID COMMAND\n"
+        "      1 /sbin/init\n"
+        "    420 /opt/buckyos/bin/node_daemon/node_daemon --enable_active\n"
+    )
+
+    def test_snapshot_answers_many_checks_with_one_listing(self):
+        snapshot = buckyos_kit.ProcessSnapshot(ttl=60)
+        with patch.object(buckyos_kit, "_system_name", "Darwin"), patch.object(
+            buckyos_kit.subprocess, "check_output", return_value=self.PS_OUTPUT
+        ) as check_output_mock:
+            self.assertTrue(buckyos_kit.check_process_exists("/opt/buckyos/bin/node_daemon", snapshot))
+            self.assertTrue(buckyos_kit.check_process_exists("node_daemon", snapshot))
+            self.assertFalse(buckyos_kit.check_process_exists("system_config", snapshot))
+
+        check_output_mock.assert_called_once()
+
+    def test_snapshot_refreshes_after_ttl(self):
+        snapshot = buckyos_kit.ProcessSnapshot(ttl=0)
+        with patch.object(buckyos_kit, "_system_name", "Darwin"), patch.object(
+            buckyos_kit.subprocess, "check_output", return_value=self.PS_OUTPUT
+        ) as check_output_mock:
+            snapshot.contains("node_daemon")
+            snapshot.contains("node_daemon")
+
+        self.assertEqual(check_output_mock.call_count, 2)
+
+    def test_windows_snapshot_matches_image_name(self):
+        snapshot = buckyos_kit.ProcessSnapshot(ttl=60)
+        output = '"System Idle Process","0","Services","0","8 K"\r\n"node_daemon.exe","420","Console","1","10,240 K"\r\n'
+        with patch.object(buckyos_kit, "_system_name", "Windows"), patch.object(
+            buckyos_kit.subprocess, "check_output", return_value=output
+        ):
+            self.assertTrue(buckyos_kit.check_process_exists("C:/buckyos/bin/NODE_DAEMON", snapshot))
+            self.assertFalse(buckyos_kit.check_process_exists("system_config", snapshot))
+
+    @unittest.skipUnless(os.path.isdir("/proc/self"), "requires procfs")
+    def test_linux_snapshot_reads_proc_without_spawning(self):
+        marker = f"buckyos-proc-scan-{os.getpid()}"
+        child = subprocess.Popen(
+            [sys.executable, "-c", "import time; print('ready', flush=True); time.sleep(30)", marker],
+            stdout=subprocess.PIPE,
+        )
+        try:
+            # Wait until the child has exec'd, otherwise /proc may still show the parent's cmdline
+            child.stdout.readline()
+            snapshot = buckyos_kit.ProcessSnapshot(ttl=60)
+            with patch.object(buckyos_kit, "_system_name", "Linux"), patch.object(
+                buckyos_kit.subprocess, "check_output"
+            ) as check_output_mock:
+                self.assertTrue(buckyos_kit.check_process_exists(marker, snapshot))
+                self.assertFalse(buckyos_kit.check_process_exists(marker + "-missing", snapshot))
+        finally:
+            child.kill()
+            child.wait()
+            child.stdout.close()
+
+        check_output_mock.assert_not_called()
+
+    def test_kill_and_start_invalidate_shared_snapshot(self):
+        with patch.object(buckyos_kit._PROC_SNAPSHOT, "invalidate") as invalidate_mock, patch.object(
+            buckyos_kit, "_system_name", "Linux"
+        ), patch.object(buckyos_kit, "_find_pids_by_name", return_value=[]), patch("builtins.print"):
+            buckyos_kit.kill_process("node_daemon")
+        invalidate_mock.assert_called_once()
+
+        with patch.object(buckyos_kit._PROC_SNAPSHOT, "invalidate") as invalidate_mock, patch.object(
+            buckyos_kit, "_system_name", "Linux"
+        ), patch.object(buckyos_kit.subprocess, "Popen"), patch.object(buckyos_kit, "_children", {}), patch(
+            "builtins.print"
+        ):
+            buckyos_kit.nohup_start(["/opt/buckyos/bin/node_daemon"])
+        invalidate_mock.assert_called_once()
+
+    def test_invalidate_forces_next_listing(self):
+        snapshot = buckyos_kit.ProcessSnapshot(ttl=60)
+        with patch.object(buckyos_kit, "_system_name", "Darwin"), patch.object(
+            buckyos_kit.subprocess, "check_output", return_value=self.PS_OUTPUT
+        ) as check_output_mock:
+            snapshot.contains("node_daemon")
+            snapshot.invalidate()
+            snapshot.contains("node_daemon")
+
+        self.assertEqual(check_output_mock.call_count, 2)
+
+
+class CheckPortTests(unittest.TestCase):
+    def test_check_ports_reports_open_and_closed_ports(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        open_port = listener.getsockname()[1]
+
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        probe.bind(("127.0.0.1", 0))
+        closed_port = probe.getsockname()[1]
+        probe.close()
+
+        try:
+            results = buckyos_kit.check_ports([open_port, closed_port, 0], timeout=1)
+        finally:
+            listener.close()
+
+        self.assertEqual(results, {open_port: True, closed_port: False, 0: True})
+
+    def test_check_port_zero_is_always_available(self):
+        self.assertTrue(buckyos_kit.check_port(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,6 @@
 import importlib
+import shutil
+import subprocess
 import tempfile
 import unittest
 from pathlib import Path
@@ -53,6 +55,49 @@ class BuildAppOptionTests(unittest.TestCase):
             build._collect_app_modules(self.make_project(), ["missing-app"])
 
 
+class BuildMainArgsTests(unittest.TestCase):
+    def run_build_main(self, argv):
+        project = BuildAppOptionTests().make_project()
+        with patch.object(build.BuckyProject, "get_project_config_file", return_value=Path("bucky_project.json")), patch.object(
+            build.BuckyProject, "get_project_local_config_file", return_value=None
+        ), patch.object(build.BuckyProject, "from_file", return_value=project), patch.object(
+            build, "build"
+        ) as build_mock, patch("builtins.print"):
+            build.build_main(argv)
+        return build_mock
+
+    def test_build_main_parses_options_in_one_pass(self):
+        build_mock = self.run_build_main(
+            ["aarch64", "--skip-web", "--timings-dir=out", "-s", "daemon", "frontend", "--app", "system,tools"]
+        )
+
+        _, target, skip_web, selected_modules, timings, timings_dir = build_mock.call_args.args
+        self.assertEqual(target, "aarch64-unknown-linux-musl")
+        self.assertTrue(skip_web)
+        self.assertEqual(selected_modules, {"daemon", "frontend"})
+        self.assertTrue(timings)
+        self.assertEqual(timings_dir, Path("out"))
+
+    def test_build_main_target_option_overrides_positional(self):
+        build_mock = self.run_build_main(["amd64", "--target=x86_64-unknown-linux-gnu"])
+
+        self.assertEqual(build_mock.call_args.args[1], "x86_64-unknown-linux-gnu")
+
+    def test_build_main_ignores_option_prefixes(self):
+        build_mock = self.run_build_main(["--skip", "--tar=x86_64-unknown-linux-gnu", "--tim"])
+
+        _, target, skip_web, _, timings, _ = build_mock.call_args.args
+        self.assertNotEqual(target, "x86_64-unknown-linux-gnu")
+        self.assertFalse(skip_web)
+        self.assertFalse(timings)
+
+    def test_build_main_rejects_empty_app_list(self):
+        with self.assertRaises(SystemExit) as raised:
+            self.run_build_main(["--app="])
+
+        self.assertEqual(raised.exception.code, 1)
+
+
 class BuildRustTimingsTests(unittest.TestCase):
     def test_build_rust_modules_adds_cargo_timings_flag(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -119,6 +164,256 @@ class BuildRustTimingsTests(unittest.TestCase):
             self.assertIn("--timings", cargo_args)
             self.assertTrue((output_dir / "cargo-timing-test.html").exists())
 
+    def test_build_rust_modules_layers_env_in_override_order(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project = BuckyProject(
+                name="test-project",
+                version="0.2.0",
+                base_dir=Path(tmp_dir),
+                modules={"daemon": RustModuleInfo(name="daemon")},
+                rust_env={"RUSTFLAGS": "-C opt-level=3"},
+            )
+            project.rust_target_dir = Path(tmp_dir) / "target"
+
+            with patch.dict(build_rust.os.environ, {"BUCKYOS_GIT_COMMIT": "from-env"}), patch.object(
+                build_rust,
+                "get_build_metadata",
+                return_value={"BUCKYOS_GIT_COMMIT": "abc", "BUCKYOS_GIT_BRANCH": "main"},
+            ), patch.object(
+                build_rust, "get_env_vars_by_target", return_value={"RUSTFLAGS": "-C target-feature=+crt-static"}
+            ), patch.object(
+                build_rust, "get_cross_compile_env_vars_by_target", return_value={"CC_test": "cross-gcc"}
+            ), patch.object(
+                build_rust, "_get_cross_compile_context", return_value=None
+            ), patch.object(build_rust.subprocess, "run") as run_mock, patch("builtins.print"):
+                build_rust.build_rust_modules(project, "aarch64-unknown-linux-gnu")
+
+        env = run_mock.call_args.kwargs["env"]
+        self.assertEqual(env["BUCKYOS_GIT_COMMIT"], "from-env")
+        self.assertEqual(env["BUCKYOS_GIT_BRANCH"], "main")
+        self.assertEqual(env["VERSION"], "0.2.0")
+        self.assertEqual(env["RUSTFLAGS"], "-C opt-level=3 -C target-feature=+crt-static")
+        self.assertEqual(env["CC_test"], "cross-gcc")
+        self.assertIn("--target", run_mock.call_args.args[0])
+
+    def test_canonical_rustflags_normalizes_spacing_and_keeps_every_flag(self):
+        self.assertEqual(
+            build_rust.canonical_rustflags(" --cfg tokio_unstable\t-C  opt-level=3 ", "-C target-feature=+crt-static"),
+            "--cfg tokio_unstable -C opt-level=3 -C target-feature=+crt-static",
+        )
+        self.assertEqual(
+            build_rust.canonical_rustflags("-l static=a -l b -l static=a", "-C link-arg=-s"),
+            "-l static=a -l b -l static=a -C link-arg=-s",
+        )
+        self.assertEqual(build_rust.canonical_rustflags("", ""), "")
+
+    def run_build_env(self, environ: dict) -> dict:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project = BuckyProject(
+                name="test-project",
+                version="0.2.0",
+                base_dir=Path(tmp_dir),
+                modules={"daemon": RustModuleInfo(name="daemon")},
+            )
+            project.rust_target_dir = Path(tmp_dir) / "target"
+
+            with patch.dict(build_rust.os.environ, environ, clear=True), patch.object(
+                build_rust, "get_build_metadata", return_value={}
+            ), patch.object(build_rust.subprocess, "run") as run_mock, patch("builtins.print"):
+                build_rust.build_rust_modules(project, build_rust.get_host_target())
+
+        return run_mock.call_args.kwargs["env"]
+
+    def test_build_rust_modules_disables_incremental_by_default(self):
+        with patch.object(build_rust, "_tool_exists", return_value=False):
+            self.assertEqual(self.run_build_env({})["CARGO_INCREMENTAL"], "0")
+            self.assertEqual(self.run_build_env({"CARGO_INCREMENTAL": "1"})["CARGO_INCREMENTAL"], "1")
+            self.assertNotIn("CARGO_INCREMENTAL", self.run_build_env({"BUCKYOS_KEEP_INCREMENTAL": "1"}))
+
+    def test_build_rust_modules_forwards_whole_environment_by_default(self):
+        environ = {"PATH": "/usr/bin", "SSL_CERT_FILE": "/etc/ssl/cert.pem", "JAVA_HOME": "/opt/jdk", "EDITOR": "vim"}
+        with patch.object(build_rust, "_tool_exists", return_value=False):
+            env = self.run_build_env(environ)
+
+        for key, value in environ.items():
+            self.assertEqual(env[key], value, key)
+
+    def test_minimal_cargo_env_forwards_only_build_related_environment(self):
+        build_related = {
+            "PATH": "/usr/bin",
+            "CARGO_HOME": "/cargo",
+            "CC_aarch64_unknown_linux_gnu": "gcc",
+            "PROTOC": "/usr/bin/protoc",
+            "LIBCLANG_PATH": "/usr/lib/llvm/lib",
+            "CMAKE_TOOLCHAIN_FILE": "/toolchain.cmake",
+            "DEVELOPER_DIR": "/Applications/Xcode.app/Contents/Developer",
+            "BINDGEN_EXTRA_CLANG_ARGS_x86_64_unknown_linux_gnu": "-I/opt/include",
+            "CFLAGS_x86_64_unknown_linux_gnu": "-O2",
+            "TARGET_CC": "clang",
+            "HOST_CC": "gcc",
+        }
+        with patch.object(build_rust, "_tool_exists", return_value=False):
+            env = self.run_build_env({**build_related, "BUCKYOS_MINIMAL_CARGO_ENV": "1", "EDITOR": "vim"})
+
+        for key, value in build_related.items():
+            self.assertEqual(env[key], value, key)
+        self.assertNotIn("EDITOR", env)
+
+    def test_build_rust_modules_uses_installed_sccache(self):
+        with patch.object(build_rust, "_tool_exists", side_effect=lambda name: name == "sccache"):
+            env = self.run_build_env({"CARGO_INCREMENTAL": "1"})
+            self.assertEqual(env["RUSTC_WRAPPER"], "sccache")
+            self.assertEqual(env["CARGO_INCREMENTAL"], "0")
+
+            env = self.run_build_env({"BUCKYOS_USE_SCCACHE": "0", "CARGO_INCREMENTAL": "1"})
+            self.assertNotIn("RUSTC_WRAPPER", env)
+            self.assertEqual(env["CARGO_INCREMENTAL"], "1")
+
+
+class CleanRustBuildTests(unittest.TestCase):
+    def make_project(self, base_dir: Path) -> BuckyProject:
+        project = BuckyProject(name="test-project", version="0.1.0", base_dir=base_dir)
+        project.rust_target_dir = base_dir / "target"
+        return project
+
+    def test_clean_packages_runs_cargo_from_base_dir(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project = self.make_project(Path(tmp_dir))
+            with patch.object(build_rust.subprocess, "run") as run_mock, patch("builtins.print"):
+                build_rust.clean_rust_build(project, ["daemon", "cli"])
+
+        self.assertEqual(
+            run_mock.call_args.args[0],
+            ["cargo", "clean", "--target-dir", str(Path(tmp_dir) / "target"), "-p", "daemon", "-p", "cli"],
+        )
+        self.assertEqual(run_mock.call_args.kwargs["cwd"], Path(tmp_dir))
+
+    def test_full_clean_moves_target_dir_aside(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project = self.make_project(Path(tmp_dir))
+            (project.rust_target_dir / "release").mkdir(parents=True)
+            with patch.object(build_rust, "nohup_start") as nohup_mock, patch("builtins.print"):
+                build_rust.clean_rust_build(project)
+
+            self.assertFalse(project.rust_target_dir.exists())
+            trash_dir = Path(nohup_mock.call_args.args[0][-1])
+            self.assertTrue(trash_dir.name.startswith("target.old-"))
+            self.assertTrue((trash_dir / "release").is_dir())
+
+    def test_full_clean_sweeps_leftover_trash_dirs(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project = self.make_project(Path(tmp_dir))
+            project.rust_target_dir.mkdir()
+            leftover = Path(tmp_dir) / "target.old-12345678"
+            leftover.mkdir()
+            with patch.object(build_rust, "nohup_start") as nohup_mock, patch("builtins.print") as print_mock:
+                build_rust.clean_rust_build(project)
+
+            removed = nohup_mock.call_args.args[0][3:]
+            self.assertEqual(len(removed), 2)
+            self.assertEqual(removed[0], str(leftover))
+            self.assertTrue(Path(removed[1]).name.startswith("target.old-"))
+            self.assertIn(str(leftover), " ".join(str(call.args[0]) for call in print_mock.call_args_list))
+
+    def test_full_clean_falls_back_to_cargo_when_rename_fails(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project = self.make_project(Path(tmp_dir))
+            project.rust_target_dir.mkdir()
+            with patch.object(build_rust.os, "rename", side_effect=PermissionError("in use")), patch.object(
+                build_rust.subprocess, "run"
+            ) as run_mock, patch.object(build_rust, "nohup_start") as nohup_mock, patch("builtins.print"):
+                build_rust.clean_rust_build(project)
+
+        self.assertEqual(run_mock.call_args.args[0], ["cargo", "clean", "--target-dir", str(Path(tmp_dir) / "target")])
+        nohup_mock.assert_not_called()
+
+
+@unittest.skipUnless(shutil.which("git"), "requires git")
+class BuildMetadataTests(unittest.TestCase):
+    def git(self, repo_dir: str, *args: str) -> str:
+        return subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+            cwd=repo_dir, check=True, capture_output=True, text=True,
+        ).stdout.strip()
+
+    def setUp(self):
+        build_rust._cached_build_metadata.cache_clear()
+        self.addCleanup(build_rust._cached_build_metadata.cache_clear)
+
+    def test_build_metadata_reads_commit_branch_and_dirty_state(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.git(tmp_dir, "init", "-q", "-b", "release")
+            (Path(tmp_dir) / "README").write_text("v1", encoding="utf-8")
+            self.git(tmp_dir, "add", "README")
+            self.git(tmp_dir, "commit", "-q", "-m", "init")
+            head = self.git(tmp_dir, "rev-parse", "HEAD")
+
+            clean = build_rust.get_build_metadata(tmp_dir)
+            (Path(tmp_dir) / "README").write_text("v2", encoding="utf-8")
+            build_rust._cached_build_metadata.cache_clear()
+            dirty = build_rust.get_build_metadata(tmp_dir)
+
+        self.assertEqual(clean["BUCKYOS_GIT_COMMIT"], head[:12])
+        self.assertEqual(clean["BUCKYOS_GIT_BRANCH"], "release")
+        self.assertEqual(clean["BUCKYOS_GIT_DESCRIBE"], head[:7])
+        self.assertEqual(clean["BUCKYOS_GIT_DIRTY"], "0")
+        self.assertEqual(dirty["BUCKYOS_GIT_DIRTY"], "1")
+        self.assertTrue(dirty["BUCKYOS_GIT_DESCRIBE"].endswith("-dirty"))
+
+    def test_build_metadata_can_skip_dirty_probe(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.git(tmp_dir, "init", "-q")
+            (Path(tmp_dir) / "README").write_text("v1", encoding="utf-8")
+            self.git(tmp_dir, "add", "README")
+            self.git(tmp_dir, "commit", "-q", "-m", "init")
+            (Path(tmp_dir) / "README").write_text("v2", encoding="utf-8")
+
+            env = build_rust.get_build_metadata(tmp_dir, need_dirty=False)
+
+        self.assertEqual(env["BUCKYOS_GIT_DIRTY"], "0")
+        self.assertFalse(env["BUCKYOS_GIT_DESCRIBE"].endswith("-dirty"))
+
+    def test_dirty_probe_skipped_only_when_outputs_are_pinned(self):
+        project = BuckyProject(name="test-project", version="0.1.0", rust_env={"VERSION_EXTEND": "release"})
+        with patch.dict(build_rust.os.environ, {"BUCKYOS_GIT_DIRTY": "0"}):
+            self.assertFalse(build_rust._needs_git_dirty(project))
+        with patch.dict(build_rust.os.environ, clear=True):
+            self.assertTrue(build_rust._needs_git_dirty(project))
+
+    def test_pygit2_metadata_matches_git_cli(self):
+        try:
+            import pygit2  # noqa: F401
+        except ImportError:
+            self.skipTest("requires pygit2")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.git(tmp_dir, "init", "-q", "-b", "release")
+            (Path(tmp_dir) / "README").write_text("v1", encoding="utf-8")
+            self.git(tmp_dir, "add", "README")
+            self.git(tmp_dir, "commit", "-q", "-m", "init")
+            self.git(tmp_dir, "tag", "v1.0")
+            (Path(tmp_dir) / "README").write_text("v2", encoding="utf-8")
+
+            self.assertEqual(build_rust._pygit2_metadata(tmp_dir), build_rust._git_cli_metadata(tmp_dir))
+
+    def test_build_metadata_is_probed_once_per_base_dir(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(
+            build_rust, "_git_cli_metadata", return_value=dict(build_rust._UNKNOWN_GIT_METADATA)
+        ) as cli_mock, patch.object(build_rust, "_pygit2_metadata", return_value=None):
+            first = build_rust.get_build_metadata(tmp_dir)
+            first["BUCKYOS_GIT_BRANCH"] = "mutated"
+            second = build_rust.get_build_metadata(tmp_dir)
+
+        cli_mock.assert_called_once()
+        self.assertEqual(second["BUCKYOS_GIT_BRANCH"], "unknown")
+
+    def test_build_metadata_outside_repo_is_unknown(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            env = build_rust.get_build_metadata(tmp_dir)
+
+        self.assertEqual(env["BUCKYOS_GIT_COMMIT"], "unknown")
+        self.assertEqual(env["BUCKYOS_GIT_DIRTY"], "0")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -16,6 +16,11 @@ def _mock_which_factory(resolved_tools):
 
 
 class BuildRustMuslToolchainTests(unittest.TestCase):
+    def setUp(self):
+        # Tool lookups are memoized per process; each test mocks its own PATH
+        build_rust._tool_exists.cache_clear()
+        self.addCleanup(build_rust._tool_exists.cache_clear)
+
     def test_x86_64_musl_prefers_triplet_toolchain(self):
         with patch.object(build_rust, "get_host_target", return_value="x86_64-unknown-linux-gnu"):
             with patch.object(
@@ -0,0 +1,185 @@
+import importlib
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.project import BuckyProject, RustModuleInfo, WebModuleInfo
+
+build_web_apps = importlib.import_module("src.build_web_apps")
+web_deps = importlib.import_module("src.web_deps")
+
+
+def make_project(base_dir: Path) -> BuckyProject:
+    return BuckyProject(
+        name="test-project",
+        version="0.1.0",
+        base_dir=base_dir,
+        modules={
+            "frontend": WebModuleInfo(name="frontend", src_dir=Path("web/frontend")),
+            "admin": WebModuleInfo(name="admin", src_dir=Path("web/admin")),
+            "daemon": RustModuleInfo(name="daemon"),
+        },
+    )
+
+
+class GithubDependenciesTests(unittest.TestCase):
+    PACKAGE = {
+        "name": "frontend",
+        "devDependencies": {"dev-kit": "github:buckyos/dev-kit"},
+        "dependencies": {
+            "lodash.merge": "GITHUB:buckyos/lodash.merge",
+            "@buckyos/sdk": "git+ssh://git@github.com/buckyos/sdk.git",
+            "react": "^18.0.0",
+        },
+        "scripts": {"build": "vite build"},
+    }
+
+    def setUp(self):
+        web_deps._cache.clear()
+        self.addCleanup(web_deps._cache.clear)
+
+    def check_dependencies(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            package_json = Path(tmp_dir) / "package.json"
+            package_json.write_text(json.dumps(self.PACKAGE), encoding="utf-8")
+            self.assertEqual(web_deps.get_github_dependencies(str(package_json)), ["lodash.merge", "@buckyos/sdk"])
+
+            package_json.write_text('{"dependencies": {"ui-kit": "github:', encoding="utf-8")
+            with patch("builtins.print"):
+                self.assertEqual(web_deps.get_github_dependencies(str(package_json)), [])
+
+    def test_streaming_parser(self):
+        try:
+            import ijson  # noqa: F401
+        except ImportError:
+            self.skipTest("requires ijson")
+        self.check_dependencies()
+
+    def test_results_are_cached_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            package_json = Path(tmp_dir) / "package.json"
+            package_json.write_text(json.dumps(self.PACKAGE), encoding="utf-8")
+            first = web_deps.get_github_dependencies(str(package_json))
+            with patch.object(web_deps, "_iter_dependencies") as iter_mock:
+                self.assertEqual(web_deps.get_github_dependencies(str(package_json)), first)
+            iter_mock.assert_not_called()
+
+            package_json.write_text(json.dumps({"dependencies": {"ui": "github:buckyos/ui"}}), encoding="utf-8")
+            self.assertEqual(web_deps.get_github_dependencies(str(package_json)), ["ui"])
+
+    def test_json_load_fallback(self):
+        with patch.dict(sys.modules, {"ijson": None}):
+            self.check_dependencies()
+
+
+class WebModuleCommandTests(unittest.TestCase):
+    def test_github_dependencies_add_update_step(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            work_dir = Path(tmp_dir) / "web" / "frontend"
+            work_dir.mkdir(parents=True)
+            (work_dir / "package.json").write_text(
+                json.dumps({"dependencies": {"ui-kit": "github:buckyos/ui-kit", "react": "^18.0.0"}}),
+                encoding="utf-8",
+            )
+
+            with patch.object(build_web_apps, "_pnpm_command", return_value="pnpm"), patch("builtins.print"):
+                resolved_dir, cmds = build_web_apps._web_module_commands(make_project(Path(tmp_dir)), "frontend")
+
+        self.assertEqual(resolved_dir, work_dir)
+        self.assertEqual(
+            cmds,
+            [
+                ["pnpm", "install", "--prefer-offline", "--no-frozen-lockfile"],
+                ["pnpm", "update", "ui-kit"],
+                ["pnpm", "run", "build"],
+            ],
+        )
+
+    def test_plain_dependencies_skip_update_step(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            work_dir = Path(tmp_dir) / "web" / "frontend"
+            work_dir.mkdir(parents=True)
+            (work_dir / "package.json").write_text(json.dumps({"dependencies": {"react": "^18.0.0"}}), encoding="utf-8")
+
+            with patch.object(build_web_apps, "_pnpm_command", return_value="pnpm"), patch("builtins.print"):
+                _, cmds = build_web_apps._web_module_commands(make_project(Path(tmp_dir)), "frontend")
+
+        self.assertEqual(cmds, [["pnpm", "install", "--prefer-offline"], ["pnpm", "run", "build"]])
+
+
+class BuildWebModulesTests(unittest.TestCase):
+    def fake_commands(self, exit_codes):
+        def _commands(project, module_name):
+            code = exit_codes.get(module_name, 0)
+            work_dir = project.base_dir / "web" / module_name
+            work_dir.mkdir(parents=True, exist_ok=True)
+            return work_dir, [[sys.executable, "-c", f"import sys; print('{module_name}'); sys.exit({code})"]]
+
+        return _commands
+
+    def test_build_web_modules_runs_every_selected_module(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(
+            build_web_apps, "_web_module_commands", side_effect=self.fake_commands({})
+        ) as commands_mock, patch("builtins.print"):
+            build_web_apps.build_web_modules(make_project(Path(tmp_dir)))
+
+        self.assertEqual(sorted(call.args[1] for call in commands_mock.call_args_list), ["admin", "frontend"])
+
+    def test_build_web_modules_bounds_parallelism(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(
+            build_web_apps, "_web_module_commands", side_effect=self.fake_commands({})
+        ), patch.object(
+            build_web_apps, "_build_web_modules_concurrently", new_callable=MagicMock
+        ) as concurrent_mock, patch.object(
+            build_web_apps.asyncio, "run"
+        ), patch("builtins.print"):
+            build_web_apps.build_web_modules(make_project(Path(tmp_dir)), max_parallel=1)
+            self.assertEqual(concurrent_mock.call_args.args[1], 1)
+            build_web_apps.build_web_modules(make_project(Path(tmp_dir)), max_parallel=16)
+            self.assertEqual(concurrent_mock.call_args.args[1], 2)
+
+    def test_modules_of_one_workspace_build_serially(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "web").mkdir()
+            (Path(tmp_dir) / "web" / "pnpm-workspace.yaml").write_text("packages:\n  - '*'\n", encoding="utf-8")
+            with patch.object(
+                build_web_apps, "_web_module_commands", side_effect=self.fake_commands({})
+            ), patch.object(
+                build_web_apps, "_build_web_modules_concurrently", new_callable=MagicMock
+            ) as concurrent_mock, patch.object(build_web_apps.asyncio, "run"), patch("builtins.print"):
+                build_web_apps.build_web_modules(make_project(Path(tmp_dir)), max_parallel=16)
+
+        groups, limit = concurrent_mock.call_args.args
+        self.assertEqual(limit, 1)
+        self.assertEqual([[job[0] for job in jobs] for jobs in groups], [["frontend", "admin"]])
+
+    def test_workspace_root_lookup(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            module_dir = Path(tmp_dir) / "web" / "frontend"
+            module_dir.mkdir(parents=True)
+            self.assertEqual(build_web_apps._pnpm_workspace_root(module_dir), module_dir)
+
+            (Path(tmp_dir) / "web" / "pnpm-lock.yaml").write_text("", encoding="utf-8")
+            self.assertEqual(build_web_apps._pnpm_workspace_root(module_dir), Path(tmp_dir) / "web")
+
+            (module_dir / "pnpm-workspace.yaml").write_text("", encoding="utf-8")
+            self.assertEqual(build_web_apps._pnpm_workspace_root(module_dir), module_dir)
+
+    def test_build_web_modules_raises_after_all_modules_finish(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(
+            build_web_apps, "_web_module_commands", side_effect=self.fake_commands({"admin": 3})
+        ), patch("builtins.print") as print_mock:
+            with self.assertRaises(subprocess.CalledProcessError) as raised:
+                build_web_apps.build_web_modules(make_project(Path(tmp_dir)))
+
+        self.assertEqual(raised.exception.returncode, 3)
+        printed = " ".join(str(call.args[0]) for call in print_mock.call_args_list if call.args)
+        self.assertIn("Build web module frontend completed", printed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,332 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.project import AppInfo, BuckyProject
+
+install = importlib.import_module("src.install")
+
+
+class AppRootfsTests(unittest.TestCase):
+    def make_project(self, base_dir: Path) -> BuckyProject:
+        rootfs = base_dir / "rootfs"
+        (rootfs / "bin" / "web").mkdir(parents=True)
+        (rootfs / "bin" / "daemon").write_text("#!/bin/sh\n", encoding="utf-8")
+        (rootfs / "bin" / "web" / "index.html").write_text("<html>", encoding="utf-8")
+        (rootfs / "etc").mkdir()
+        (rootfs / "etc" / "app.json").write_text("{}", encoding="utf-8")
+        app = AppInfo(
+            name="demo",
+            rootfs=Path("rootfs"),
+            default_target_rootfs=base_dir / "target",
+            modules={"daemon": "bin/daemon", "web": "bin/web/"},
+            data_paths=[Path("etc/app.json"), Path("data/cache")],
+        )
+        return BuckyProject(name="demo", version="0.1.0", base_dir=base_dir, apps={"demo": app})
+
+    def test_update_app_and_install_app_data(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            base_dir = Path(tmp_dir)
+            project = self.make_project(base_dir)
+            target = base_dir / "target"
+
+            with patch("builtins.print"):
+                install.update_app(project, "demo")
+                install.install_app_data(project, "demo")
+
+            self.assertEqual((target / "bin" / "web" / "index.html").read_text(encoding="utf-8"), "<html>")
+            self.assertEqual((target / "etc" / "app.json").read_text(encoding="utf-8"), "{}")
+            self.assertTrue((target / "data" / "cache").is_dir())
+            if os.name != "nt":
+                self.assertTrue(os.access(target / "bin" / "daemon", os.X_OK))
+
+
+class ReinstallAppsTests(unittest.TestCase):
+    def make_project(self, base_dir: Path, second_clean_paths) -> BuckyProject:
+        apps = {
+            "files": AppInfo(
+                name="files",
+                rootfs=Path("rootfs"),
+                default_target_rootfs=base_dir / "target",
+                modules={"files": "bin/files/"},
+                clean_paths=[Path("bin/files")],
+            ),
+            "photos": AppInfo(
+                name="photos",
+                rootfs=Path("rootfs"),
+                default_target_rootfs=base_dir / "target",
+                modules={"photos": "bin/photos/"},
+                clean_paths=second_clean_paths,
+            ),
+        }
+        return BuckyProject(name="demo", version="0.1.0", base_dir=base_dir, apps=apps)
+
+    def test_disjoint_apps_are_reinstalled_concurrently(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project = self.make_project(Path(tmp_dir), [Path("bin/photos")])
+            with patch.object(install, "reinstall_app") as reinstall_mock, patch.object(
+                install, "ThreadPoolExecutor", wraps=install.ThreadPoolExecutor
+            ) as pool_mock:
+                install.reinstall_apps(project, ["files", "photos"])
+
+        pool_mock.assert_called_once()
+        self.assertEqual(sorted(call.args[1] for call in reinstall_mock.call_args_list), ["files", "photos"])
+
+    def test_overlapping_apps_are_reinstalled_in_order(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project = self.make_project(Path(tmp_dir), [Path("bin")])
+            with patch.object(install, "reinstall_app") as reinstall_mock, patch.object(
+                install, "ThreadPoolExecutor"
+            ) as pool_mock:
+                install.reinstall_apps(project, ["files", "photos"])
+
+        pool_mock.assert_not_called()
+        self.assertEqual([call.args[1] for call in reinstall_mock.call_args_list], ["files", "photos"])
+
+
+class InstallBuckyosAppsTests(unittest.TestCase):
+    def test_downloads_every_archive_and_unzips_successful_ones(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "VERSION"), "w") as f:
+                f.write("0.4.0\n")
+            self.run_install(tmp_dir)
+
+    def run_install(self, tmp_dir):
+        with patch.object(install, "src_dir", tmp_dir), patch.object(
+            install, "install_root_dir", tmp_dir, create=True
+        ), patch.object(install, "_system_name", "Darwin"), patch.object(
+            install, "_arch_name", "x86_64"
+        ), patch.dict(os.environ, {"TEMP": tmp_dir}), patch.object(
+            install, "download_file", side_effect=lambda url, path, **kwargs: path.endswith("-img.zip")
+        ) as download_mock, patch.object(install, "unzip_to_dir") as unzip_mock, patch.object(
+            install, "_remote_file_info", return_value=None
+        ), patch("builtins.print"):
+            install.install_buckyos_apps()
+
+        urls = sorted(call.args[0] for call in download_mock.call_args_list)
+        self.assertEqual(len(urls), 2)
+        self.assertTrue(urls[0].endswith("/0.4.0/nightly-darwin-amd64.buckyos-filebrowser-bin.zip"))
+        self.assertTrue(urls[1].endswith("/nightly-linux-amd64.buckyos-filebrowser-img.zip"))
+        unzip_mock.assert_called_once()
+        self.assertEqual(unzip_mock.call_args.args[1], os.path.join(tmp_dir, "bin", "buckyos-filebrowser-img"))
+
+
+class DownloadAndUnzipTests(unittest.TestCase):
+    def run_task(self, tmp_dir, remote):
+        zip_path = os.path.join(tmp_dir, "app-img.zip")
+        unzip_dir = os.path.join(tmp_dir, "bin", "app-img")
+        with patch.object(install, "_remote_file_info", return_value=remote), patch.object(
+            install, "download_file", return_value=True
+        ) as download_mock, patch.object(install, "unzip_to_dir") as unzip_mock, patch("builtins.print"):
+            install._download_and_unzip("app-img.zip", "https://example.com/app-img.zip", zip_path, unzip_dir)
+        return download_mock, unzip_mock
+
+    def prepare(self, tmp_dir, etag):
+        zip_path = os.path.join(tmp_dir, "app-img.zip")
+        with open(zip_path, "wb") as f:
+            f.write(b"12345")
+        with open(zip_path + ".etag", "w") as f:
+            f.write(etag)
+        os.makedirs(os.path.join(tmp_dir, "bin", "app-img"))
+        return zip_path
+
+    def test_complete_download_and_unzip_are_skipped(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.prepare(tmp_dir, '"v1"')
+            download_mock, unzip_mock = self.run_task(tmp_dir, (5, '"v1"'))
+            download_mock.assert_not_called()
+            unzip_mock.assert_called_once()
+
+            download_mock, unzip_mock = self.run_task(tmp_dir, (5, '"v1"'))
+            download_mock.assert_not_called()
+            unzip_mock.assert_not_called()
+
+    def test_changed_etag_discards_local_zip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = self.prepare(tmp_dir, '"v1"')
+            download_mock, unzip_mock = self.run_task(tmp_dir, (5, '"v2"'))
+
+            download_mock.assert_called_once()
+            unzip_mock.assert_called_once()
+            self.assertFalse(os.path.exists(zip_path))
+            self.assertFalse(download_mock.call_args.kwargs["resume"])
+            with open(zip_path + ".etag") as f:
+                self.assertEqual(f.read(), '"v2"')
+
+    def test_missing_etag_never_resumes_leftover_zip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = self.prepare(tmp_dir, '"v1"')
+            download_mock, unzip_mock = self.run_task(tmp_dir, (5, None))
+
+            download_mock.assert_called_once()
+            self.assertFalse(download_mock.call_args.kwargs["resume"])
+            unzip_mock.assert_called_once()
+            self.assertFalse(os.path.exists(zip_path))
+            self.assertFalse(os.path.exists(zip_path + ".etag"))
+
+    def test_matching_etag_resumes_partial_zip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.prepare(tmp_dir, '"v1"')
+            download_mock, _ = self.run_task(tmp_dir, (9, '"v1"'))
+
+            self.assertTrue(download_mock.call_args.kwargs["resume"])
+            self.assertEqual(download_mock.call_args.kwargs["expected_length"], 9)
+
+
+class UnzipToDirTests(unittest.TestCase):
+    def test_strips_top_level_directory(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = os.path.join(tmp_dir, "app-img.zip")
+            with zipfile.ZipFile(zip_path, "w") as zf:
+                zf.writestr("buckyos-filebrowser/", "")
+                start_sh = zipfile.ZipInfo("buckyos-filebrowser/bin/start.sh")
+                start_sh.external_attr = 0o100755 << 16
+                zf.writestr(start_sh, "#!/bin/sh\n")
+                zf.writestr("buckyos-filebrowser/config.json", "{}")
+            target_dir = os.path.join(tmp_dir, "bin", "buckyos-filebrowser-img")
+
+            with patch("builtins.print"):
+                install.unzip_to_dir(zip_path, target_dir)
+
+            with open(os.path.join(target_dir, "bin", "start.sh")) as f:
+                self.assertEqual(f.read(), "#!/bin/sh\n")
+            self.assertEqual(sorted(os.listdir(target_dir)), ["bin", "config.json"])
+            self.assertEqual(sorted(os.listdir(tmp_dir)), ["app-img.zip", "bin"])
+            if os.name != "nt":
+                self.assertTrue(os.access(os.path.join(target_dir, "bin", "start.sh"), os.X_OK))
+
+    def test_parallel_extraction_writes_every_member(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = os.path.join(tmp_dir, "app-bin.zip")
+            with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for i in range(50):
+                    zf.writestr(f"app/assets/{i % 5}/{i}.js", f"chunk {i}" * 100)
+            target_dir = os.path.join(tmp_dir, "out")
+
+            with patch("builtins.print"):
+                install.unzip_to_dir(zip_path, target_dir, workers=4)
+
+            for i in range(50):
+                with open(os.path.join(target_dir, "assets", str(i % 5), f"{i}.js")) as f:
+                    self.assertEqual(f.read(), f"chunk {i}" * 100)
+
+    def test_unsupported_compression_needs_libarchive(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = os.path.join(tmp_dir, "app-img.zip")
+            with zipfile.ZipFile(zip_path, "w") as zf:
+                zf.writestr("app/config.json", "{}")
+
+            with patch.object(install, "_ZIPFILE_METHODS", set()), patch.dict(sys.modules, {"libarchive": None}):
+                with self.assertRaises(RuntimeError):
+                    install.unzip_to_dir(zip_path, os.path.join(tmp_dir, "out"))
+
+    def test_rejects_members_outside_target(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = os.path.join(tmp_dir, "evil.zip")
+            with zipfile.ZipFile(zip_path, "w") as zf:
+                zf.writestr("app/../../escape.txt", "x")
+
+            with self.assertRaises(ValueError):
+                install.unzip_to_dir(zip_path, os.path.join(tmp_dir, "out"))
+            self.assertFalse(os.path.exists(os.path.join(tmp_dir, "escape.txt")))
+
+
+class DownloadFileTests(unittest.TestCase):
+    def fake_response(self, status, body=b"", headers=None):
+        resp = MagicMock()
+        resp.status_code = status
+        resp.headers = headers or {}
+        resp.iter_content.side_effect = lambda chunk_size: iter([body[:3], body[3:]])
+        return resp
+
+    def download(self, existing, resp, **kwargs):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "app-img.zip")
+            if existing is not None:
+                with open(path, "wb") as f:
+                    f.write(existing)
+            responses = resp if isinstance(resp, list) else [resp]
+            http = MagicMock()
+            http.get.side_effect = responses
+            with patch.object(install, "_http", http), patch("builtins.print"):
+                ok = install.download_file("https://example.com/app-img.zip", path, **kwargs)
+            with open(path, "rb") as f:
+                content = f.read()
+        for r in responses:
+            r.close.assert_called()
+        return ok, content, http.get.call_args.kwargs["headers"]
+
+    def test_fresh_download_writes_whole_body(self):
+        ok, content, headers = self.download(None, self.fake_response(200, b"zipdata"))
+        self.assertTrue(ok)
+        self.assertEqual(content, b"zipdata")
+        self.assertIsNone(headers)
+
+    def test_requests_use_timeouts(self):
+        http = MagicMock()
+        http.head.return_value = self.fake_response(200, headers={"Content-Length": "7", "ETag": '"v1"'})
+        with patch.object(install, "_http", http):
+            self.assertEqual(install._remote_file_info("https://example.com/app-img.zip"), (7, '"v1"'))
+        self.assertEqual(http.head.call_args.kwargs["timeout"], install._HTTP_TIMEOUT)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            http.get.return_value = self.fake_response(200, b"zipdata")
+            with patch.object(install, "_http", http), patch("builtins.print"):
+                install.download_file("https://example.com/app-img.zip", os.path.join(tmp_dir, "app-img.zip"))
+        self.assertEqual(http.get.call_args.kwargs["timeout"], install._HTTP_TIMEOUT)
+
+    def test_partial_file_is_resumed_with_range(self):
+        ok, content, headers = self.download(b"zip", self.fake_response(206, b"data"))
+        self.assertTrue(ok)
+        self.assertEqual(content, b"zipdata")
+        self.assertEqual(headers, {"Range": "bytes=3-"})
+
+    def test_range_ignored_restarts_file(self):
+        ok, content, _ = self.download(b"old", self.fake_response(200, b"zipdata"))
+        self.assertTrue(ok)
+        self.assertEqual(content, b"zipdata")
+
+    def test_resume_disabled_ignores_existing_file(self):
+        ok, content, headers = self.download(b"old", self.fake_response(200, b"zipdata"), resume=False)
+        self.assertTrue(ok)
+        self.assertEqual(content, b"zipdata")
+        self.assertIsNone(headers)
+
+    def test_416_with_matching_size_is_complete(self):
+        resp = self.fake_response(416, headers={"Content-Range": "bytes */7"})
+        ok, content, _ = self.download(b"zipdata", resp)
+        self.assertTrue(ok)
+        self.assertEqual(content, b"zipdata")
+
+    def test_416_with_other_size_downloads_again(self):
+        responses = [self.fake_response(416, headers={"Content-Range": "bytes */7"}), self.fake_response(200, b"zipdata")]
+        ok, content, headers = self.download(b"stale old zip", responses)
+        self.assertTrue(ok)
+        self.assertEqual(content, b"zipdata")
+        self.assertIsNone(headers)
+
+        responses = [self.fake_response(416), self.fake_response(200, b"zipdata")]
+        ok, content, _ = self.download(b"zipdata", responses, expected_length=9)
+        self.assertTrue(ok)
+        self.assertEqual(content, b"zipdata")
+
+    def test_http_error_status_fails(self):
+        ok, _, _ = self.download(b"zip", self.fake_response(404))
+        self.assertFalse(ok)
+
+    def test_session_honors_proxy_environment(self):
+        proxies = {"HTTPS_PROXY": "http://proxy.example:3128", "NO_PROXY": "localhost"}
+        with patch.dict(os.environ, proxies):
+            settings = install._http.merge_environment_settings(
+                "https://github.com/buckyos/filebrowser/releases/download/app.zip", {}, None, None, None
+            )
+        self.assertEqual(settings["proxies"].get("https"), "http://proxy.example:3128")
+
+
+if __name__ == "__main__":
+    unittest.main()
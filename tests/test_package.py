@@ -0,0 +1,19 @@
+import importlib
+import unittest
+
+package = importlib.import_module("src")
+
+
+class PackageExportTests(unittest.TestCase):
+    def test_dir_lists_lazy_names(self):
+        self.assertEqual(sorted(dir(package)), sorted(package.__all__))
+        for name in ("CertManager", "BuckyProject", "install_app_data", "buckyos_kit"):
+            self.assertIn(name, dir(package))
+
+    def test_lazy_names_resolve(self):
+        for name in package.__all__:
+            self.assertIsNotNone(getattr(package, name), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import importlib
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+project = importlib.import_module("src.project")
+BuckyProject = project.BuckyProject
+
+CONFIG = {
+    "name": "démo",
+    "version": "0.2.0",
+    "modules": {
+        "frontend": {"type": "web", "name": "frontend", "src_dir": "web/frontend"},
+        "daemon": {"type": "rust", "name": "daemon", "file_only": True},
+    },
+    "apps": {
+        "system": {
+            "name": "system",
+            "rootfs": "rootfs",
+            "default_target_rootfs": "/opt/buckyos",
+            "modules": {"daemon": "bin/daemon", "frontend": "bin/web/"},
+            "data_paths": ["etc/app.json"],
+        }
+    },
+    "rust_env": {"RUSTFLAGS": "-C target-feature=+crt-static"},
+}
+
+
+class ProjectConfigFileTests(unittest.TestCase):
+    def setUp(self):
+        project._CONFIG_DATA_CACHE.clear()
+        self.addCleanup(project._CONFIG_DATA_CACHE.clear)
+
+    def check_round_trip(self, suffix):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = Path(tmp_dir) / f"bucky_project{suffix}"
+            config_file.write_text(json.dumps(CONFIG), encoding="utf-8")
+            loaded = BuckyProject.from_file(config_file)
+
+            saved_file = Path(tmp_dir) / f"saved{suffix}"
+            with patch("builtins.print"):
+                loaded.save(saved_file)
+            reloaded = BuckyProject.from_file(saved_file)
+
+        self.assertEqual(loaded.name, "démo")
+        self.assertTrue(loaded.modules["daemon"].file_only)
+        self.assertEqual(loaded.apps["system"].data_paths, [Path("etc/app.json")])
+        self.assertEqual(reloaded.to_dict(), loaded.to_dict())
+        self.assertEqual(loaded.to_dict()["modules"]["frontend"]["type"], "web")
+        self.assertEqual(loaded.to_dict()["modules"]["daemon"]["type"], "rust")
+
+    def test_json_round_trip(self):
+        self.check_round_trip(".json")
+
+    def test_json_round_trip_without_orjson(self):
+        with patch.object(project, "orjson", None):
+            self.check_round_trip(".json")
+
+    def test_yaml_round_trip(self):
+        # JSON is valid YAML, so the same fixture loads through both parsers
+        self.check_round_trip(".yaml")
+
+    def test_parsed_config_is_reused_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = Path(tmp_dir) / "bucky_project.json"
+            config_file.write_text(json.dumps(CONFIG), encoding="utf-8")
+            first = BuckyProject.from_file(config_file)
+            first.rust_env["RUSTFLAGS"] = "mutated"
+
+            loader = MagicMock()
+            with patch.dict(project._LOADERS, {".json": loader}):
+                second = BuckyProject.from_file(config_file)
+            loader.assert_not_called()
+            self.assertEqual(second.rust_env["RUSTFLAGS"], "-C target-feature=+crt-static")
+
+            config_file.write_text(json.dumps({**CONFIG, "version": "0.3.0"}), encoding="utf-8")
+            self.assertEqual(BuckyProject.from_file(config_file).version, "0.3.0")
+
+    def test_yaml_requires_pyyaml(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = Path(tmp_dir) / "bucky_project.yaml"
+            config_file.write_text("name: demo\n", encoding="utf-8")
+            with patch.object(project, "yaml", None):
+                with self.assertRaises(ImportError):
+                    BuckyProject.from_file(config_file)
+
+    def test_repeated_path_strings_share_one_path(self):
+        app_data = {"name": "a", "rootfs": "rootfs", "default_target_rootfs": "/opt/buckyos", "data_paths": ["rootfs"]}
+        first = project.AppInfo.from_dict(app_data)
+        second = project.AppInfo.from_dict({**app_data, "name": "b"})
+
+        self.assertIs(first.rootfs, second.rootfs)
+        self.assertIs(first.data_paths[0], first.rootfs)
+
+    def test_config_classes_use_slots(self):
+        info = project.AppInfo(name="system", rootfs=Path("rootfs"), default_target_rootfs=Path("/opt/buckyos"))
+        with self.assertRaises(AttributeError):
+            info.typo_field = True
+        self.assertFalse(hasattr(BuckyProject(name="demo", version="0.1.0"), "__dict__"))
+
+    def test_unsupported_suffix(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = Path(tmp_dir) / "bucky_project.toml"
+            config_file.write_text("", encoding="utf-8")
+            with self.assertRaises(ValueError):
+                BuckyProject.from_file(config_file)
+
+
+if __name__ == "__main__":
+    unittest.main()